@@ -33,6 +33,7 @@ from .protocol import (
     # Parsing functions
     parse_tlp_header,
     parse_tlp_packet,
+    parse_tlp_packet_batch,
     parse_usb_frame_header,
     find_usb_frame,
     parse_stream,
@@ -68,6 +69,7 @@ __all__ = [
     # Parsing functions
     "parse_tlp_header",
     "parse_tlp_packet",
+    "parse_tlp_packet_batch",
     "parse_usb_frame_header",
     "find_usb_frame",
     "parse_stream",
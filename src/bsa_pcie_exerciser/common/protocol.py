@@ -1,7 +1,7 @@
 #
 # BSA PCIe Exerciser - Common Protocol Definitions
 #
-# Copyright (c) 2025 Shareef Jalloq
+# Copyright (c) 2025-2026 Shareef Jalloq
 # SPDX-License-Identifier: BSD-2-Clause
 #
 # Defines the packet format for USB monitor streaming.
@@ -15,6 +15,7 @@
 import struct
 from dataclasses import dataclass
 from enum import IntEnum
+from functools import lru_cache
 from typing import Optional, List
 
 
@@ -58,6 +59,17 @@ USB_FRAME_HEADER_SIZE = 12  # preamble + channel + length
 TLP_HEADER_SIZE = 32   # 4 x 64-bit words = 8 x 32-bit words = 32 bytes
 TLP_HEADER_WORDS = 4   # 64-bit words
 
+# Precompiled header unpacker: the 4 x 64-bit header words as 8 little-endian
+# 32-bit halves. No field straddles a 32-bit boundary, so every field is
+# extracted from a small int.
+_unpack_tlp_header = struct.Struct('<8I').unpack_from
+
+
+@lru_cache(maxsize=None)
+def _payload_struct(words: int) -> struct.Struct:
+    """Return the compiled little-endian struct for a payload of words DWs."""
+    return struct.Struct(f'<{words}I')
+
 
 # =============================================================================
 # Enums
@@ -225,7 +237,7 @@ class TLPPacket:
     @property
     def payload_bytes(self) -> bytes:
         """Payload as raw bytes."""
-        return b''.join(struct.pack('<I', w) for w in self.payload)
+        return _payload_struct(len(self.payload)).pack(*self.payload)
 
     def __str__(self) -> str:
         """Human-readable packet summary."""
@@ -274,46 +286,42 @@ def parse_tlp_header(data: bytes) -> Optional[dict]:
     if len(data) < TLP_HEADER_SIZE:
         return None
 
-    # Parse as 8 x 32-bit words, then combine to 4 x 64-bit
-    words32 = struct.unpack('<8I', data[:TLP_HEADER_SIZE])
-    h0 = words32[0] | (words32[1] << 32)
-    h1 = words32[2] | (words32[3] << 32)
-    h2 = words32[4] | (words32[5] << 32)
-    h3 = words32[6] | (words32[7] << 32)
+    # Parse as 4 x 64-bit words, each split into (lo, hi) 32-bit halves
+    h0_lo, h0_hi, h1_lo, h1_hi, h2_lo, h2_hi, h3_lo, h3_hi = _unpack_tlp_header(data)
 
     # Parse header word 0
-    payload_length = h0 & 0x3FF              # [9:0]
-    tlp_type = (h0 >> 10) & 0xF              # [13:10]
-    direction = (h0 >> 14) & 0x1             # [14]
-    truncated = bool((h0 >> 15) & 0x1)       # [15]
-    header_words = (h0 >> 16) & 0xFFFF       # [31:16]
-    timestamp_lo = (h0 >> 32) & 0xFFFFFFFF   # [63:32]
+    payload_length = h0_lo & 0x3FF           # [9:0]
+    tlp_type = (h0_lo >> 10) & 0xF           # [13:10]
+    direction = (h0_lo >> 14) & 0x1          # [14]
+    truncated = bool((h0_lo >> 15) & 0x1)    # [15]
+    header_words = h0_lo >> 16               # [31:16]
+    timestamp_lo = h0_hi                     # [63:32]
 
     # Parse header word 1
-    timestamp_hi = h1 & 0xFFFFFFFF           # [31:0]
-    req_id = (h1 >> 32) & 0xFFFF             # [47:32]
-    tag = (h1 >> 48) & 0xFF                  # [55:48]
-    first_be = (h1 >> 56) & 0xF              # [59:56]
-    last_be = (h1 >> 60) & 0xF               # [63:60]
+    timestamp_hi = h1_lo                     # [31:0]
+    req_id = h1_hi & 0xFFFF                  # [47:32]
+    tag = (h1_hi >> 16) & 0xFF               # [55:48]
+    first_be = (h1_hi >> 24) & 0xF           # [59:56]
+    last_be = h1_hi >> 28                    # [63:60]
 
     # Combine timestamp
     timestamp = timestamp_lo | (timestamp_hi << 32)
 
     # Parse header word 2 (address)
-    address = h2
+    address = h2_lo | (h2_hi << 32)
 
     # Parse header word 3
-    we = bool(h3 & 0x1)                      # [0]
-    bar_hit = (h3 >> 1) & 0x7                # [3:1]
-    attr = (h3 >> 4) & 0x3                   # [5:4]
-    at = (h3 >> 6) & 0x3                     # [7:6]
-    pasid_valid = bool((h3 >> 8) & 0x1)      # [8]
-    pasid = (h3 >> 9) & 0xFFFFF              # [28:9]
-    privileged = bool((h3 >> 29) & 0x1)     # [29] TX requests
-    execute = bool((h3 >> 30) & 0x1)        # [30] TX requests
-    status = (h3 >> 29) & 0x7                # [31:29] completions (overlaps priv/exec)
-    cmp_id = (h3 >> 32) & 0xFFFF             # [47:32]
-    byte_count = (h3 >> 48) & 0xFFF          # [59:48]
+    we = bool(h3_lo & 0x1)                   # [0]
+    bar_hit = (h3_lo >> 1) & 0x7             # [3:1]
+    attr = (h3_lo >> 4) & 0x3                # [5:4]
+    at = (h3_lo >> 6) & 0x3                  # [7:6]
+    pasid_valid = bool((h3_lo >> 8) & 0x1)   # [8]
+    pasid = (h3_lo >> 9) & 0xFFFFF           # [28:9]
+    privileged = bool((h3_lo >> 29) & 0x1)   # [29] TX requests
+    execute = bool((h3_lo >> 30) & 0x1)      # [30] TX requests
+    status = h3_lo >> 29                     # [31:29] completions (overlaps priv/exec)
+    cmp_id = h3_hi & 0xFFFF                  # [47:32]
+    byte_count = (h3_hi >> 16) & 0xFFF       # [59:48]
 
     return {
         'payload_length': payload_length,
@@ -353,51 +361,39 @@ def parse_tlp_packet(data: bytes) -> Optional[TLPPacket]:
     Returns:
         TLPPacket if valid, None if invalid
     """
-    header = parse_tlp_header(data)
-    if header is None:
+    # Reject short packets from the payload length field alone, before
+    # paying for the full header decode
+    if len(data) < TLP_HEADER_SIZE:
         return None
-
-    # Calculate payload size (payload_length is in DWs, each DW = 4 bytes)
-    payload_words = header['payload_length']
-    payload_bytes_needed = payload_words * 4
-
-    # Check if we have enough data for payload
-    total_size = TLP_HEADER_SIZE + payload_bytes_needed
-    if len(data) < total_size:
+    payload_words = (data[0] | (data[1] << 8)) & 0x3FF
+    if len(data) < TLP_HEADER_SIZE + payload_words * 4:
         return None
 
+    header = parse_tlp_header(data)
+
     # Parse payload as 32-bit words
-    payload = []
-    for i in range(payload_words):
-        offset = TLP_HEADER_SIZE + i * 4
-        word = struct.unpack('<I', data[offset:offset+4])[0]
-        payload.append(word)
-
-    return TLPPacket(
-        payload_length=header['payload_length'],
-        tlp_type=header['tlp_type'],
-        direction=header['direction'],
-        truncated=header['truncated'],
-        header_words=header['header_words'],
-        timestamp=header['timestamp'],
-        address=header['address'],
-        req_id=header['req_id'],
-        tag=header['tag'],
-        first_be=header['first_be'],
-        last_be=header['last_be'],
-        we=header['we'],
-        bar_hit=header['bar_hit'],
-        attr=header['attr'],
-        at=header['at'],
-        pasid=header['pasid'],
-        pasid_valid=header['pasid_valid'],
-        privileged=header['privileged'],
-        execute=header['execute'],
-        status=header['status'],
-        byte_count=header['byte_count'],
-        cmp_id=header['cmp_id'],
-        payload=payload,
-    )
+    payload = list(_payload_struct(payload_words).unpack_from(data, TLP_HEADER_SIZE))
+
+    # Header dict keys match the TLPPacket fields one-to-one
+    return TLPPacket(payload=payload, **header)
+
+
+def parse_tlp_packet_batch(buffers: List[bytes]) -> List[TLPPacket]:
+    """
+    Parse a batch of captured TLP packets.
+
+    Each buffer holds one packet starting at the TLP header, as returned
+    by the USB monitor capture. Invalid packets are skipped, as in
+    parse_stream().
+
+    Args:
+        buffers: Raw packet data, one entry per packet
+
+    Returns:
+        List of parsed TLP packets, in capture order
+    """
+    packets = map(parse_tlp_packet, buffers)
+    return [pkt for pkt in packets if pkt is not None]
 
 
 def find_usb_frame(data: bytes, offset: int = 0) -> tuple[Optional[bytes], int]:
@@ -15,7 +15,8 @@ Provides BFMs for:
 """
 
 import cocotb
-from cocotb.triggers import RisingEdge, ClockCycles
+from cocotb.triggers import RisingEdge, ClockCycles, First, Timer
+from cocotb.utils import get_sim_time
 
 
 # =============================================================================
@@ -30,7 +31,7 @@ class PCIeBFM:
     Used for integration tests where TLPs go through the full depacketizer/packetizer.
     """
 
-    def __init__(self, dut, rx_prefix="phy_rx", tx_prefix="phy_tx"):
+    def __init__(self, dut, rx_prefix="phy_rx", tx_prefix="phy_tx", clk_period_ns=8):
         """
         Initialize BFM with DUT reference.
 
@@ -38,9 +39,12 @@ class PCIeBFM:
             dut: Cocotb DUT reference
             rx_prefix: Prefix for RX signals (testbench -> DUT)
             tx_prefix: Prefix for TX signals (DUT -> testbench)
+            clk_period_ns: sys_clk period, used to convert cycle timeouts
+                to simulation time while waiting for TX activity
         """
         self.dut = dut
         self.clk = dut.sys_clk
+        self.clk_period_ns = clk_period_ns
         self.rx_prefix = rx_prefix
         self.tx_prefix = tx_prefix
         self._get_signals()
@@ -123,13 +127,28 @@ class PCIeBFM:
         """
         Capture a single beat from TX path.
 
+        While the TX path is idle, sleep until tx_valid rises (or the timeout
+        expires) rather than waking on every clock edge. Once valid is seen,
+        beats are sampled on the clock for whatever is left of the timeout.
+
         Args:
-            timeout_cycles: Maximum cycles to wait
+            timeout_cycles: Maximum cycles to wait in total
 
         Returns:
             Dict with beat data, or None on timeout
         """
-        for _ in range(timeout_cycles):
+        remaining = timeout_cycles
+        if not self.tx_valid.value:
+            start_ns = get_sim_time('ns')
+            timeout = Timer(timeout_cycles * self.clk_period_ns, unit="ns")
+            fired = await First(RisingEdge(self.tx_valid), timeout)
+            if fired is timeout:
+                return None
+            # Keep at least one edge so the beat that raised valid is sampled
+            waited = int((get_sim_time('ns') - start_ns) // self.clk_period_ns)
+            remaining = max(timeout_cycles - waited, 1)
+
+        for _ in range(remaining):
             await RisingEdge(self.clk)
             if self.tx_valid.value and self.tx_ready.value:
                 return {
@@ -144,18 +163,60 @@ class PCIeBFM:
         """
         Inject complete TLP (list of beat dicts with 'dat', 'be').
 
+        Beats are driven back-to-back with rx_valid held high for the whole
+        packet; only dat/be and the first/last markers change between beats,
+        and each beat waits on a single clock edge unless rx_ready stalls it.
+
         Args:
             beats: List of dicts with 'dat' and optional 'be' keys
             bar_hit: BAR hit bitmap (default BAR0)
         """
+        clk = self.clk
+        rx_ready = self.rx_ready
+        last_index = len(beats) - 1
+
+        self.rx_bar_hit.value = bar_hit
+        self.rx_first.value = 1
+        self.rx_last.value = 1 if last_index == 0 else 0
+        self.rx_valid.value = 1
+
         for i, beat in enumerate(beats):
-            await self.inject_beat(
-                dat=beat['dat'],
-                be=beat.get('be', 0xFF),
-                bar_hit=bar_hit,
-                first=(i == 0),
-                last=(i == len(beats) - 1),
-            )
+            if i == 1:
+                self.rx_first.value = 0
+            if i == last_index and i > 0:
+                self.rx_last.value = 1
+            self.rx_dat.value = beat['dat']
+            self.rx_be.value = beat.get('be', 0xFF)
+
+            while True:
+                await RisingEdge(clk)
+                if rx_ready.value:
+                    break
+
+        self.rx_valid.value = 0
+        self.rx_first.value = 0
+        self.rx_last.value = 0
+
+    async def inject_tlp_burst(self, tlps, bar_hit=0b000001, min_gap=2):
+        """
+        Inject a sequence of TLPs with only a short idle gap between them.
+
+        Each TLP is still subject to rx_ready flow control; min_gap idle
+        cycles are inserted between TLPs so back-to-back packets remain
+        distinct at the PHY interface. rx_ready is PHY flow control only:
+        the USB monitor never backpressures it and drops packets when its
+        FIFOs fill, so tests that expect every packet to be captured must
+        pick a min_gap that covers the USB drain time.
+
+        Args:
+            tlps: Iterable of beat lists, one per TLP
+            bar_hit: BAR hit bitmap (default BAR0)
+            min_gap: Idle cycles between consecutive TLPs
+        """
+        for i, beats in enumerate(tlps):
+            if i and min_gap:
+                await ClockCycles(self.clk, min_gap)
+            await self.inject_tlp(beats, bar_hit=bar_hit)
 
     async def capture_tlp(self, timeout_cycles=1000):
         """
@@ -0,0 +1,116 @@
+#
+# BSA PCIe Exerciser - Shared Test Reset
+#
+# Copyright (c) 2025-2026 Shareef Jalloq
+# SPDX-License-Identifier: BSD-2-Clause
+#
+
+"""
+DUT reset and per-test BFM setup for the USB integration tests.
+
+Provides:
+- reset_dut: Start the clocks and pulse the resets, or skip the pulse
+  ("soft" mode) once the DUT has been reset earlier in the run
+- start_test: Reset the DUT, build the BFMs and, after a soft reset,
+  clear the state an earlier test may have left behind
+"""
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles
+
+from tbench.common.pcie_bfm import PCIeBFM
+from tbench.common.usb_bfm import USBBFM
+
+REG_USB_MON_CTRL = 0x080
+
+# DUTs that have been through a full reset in this simulation run
+_reset_duts = set()
+
+
+async def reset_dut(dut, mode: str = "full", sys_clk_period_ns: int = 8) -> str:
+    """
+    Reset and initialize clocks.
+
+    Clocks are restarted on every call: cocotb cancels every task a test
+    started, the clock drivers included, when that test ends.
+
+    Args:
+        dut: Testbench DUT
+        mode: "full" pulses all resets and waits for the design to settle.
+              "soft" only restarts the clocks, leaving the caller to clear
+              any state left by an earlier test (see start_test()); it
+              falls back to a full reset if this DUT has not been reset yet
+              in this run, e.g. when a single test is selected.
+        sys_clk_period_ns: sys_clk period in ns
+
+    Returns:
+        The reset mode actually applied
+    """
+    cocotb.start_soon(Clock(dut.sys_clk, sys_clk_period_ns, unit="ns", impl="gpi").start())
+    cocotb.start_soon(Clock(dut.pcie_clk, 8, unit="ns", impl="gpi").start())
+    cocotb.start_soon(Clock(dut.usb_clk, 10, unit="ns", impl="gpi").start())
+
+    if mode == "soft" and id(dut) in _reset_duts:
+        return "soft"
+
+    dut.sys_rst.value = 1
+    dut.pcie_rst.value = 1
+    dut.usb_rst.value = 1
+
+    dut.phy_rx_valid.value = 0
+    dut.phy_tx_ready.value = 1
+
+    await ClockCycles(dut.sys_clk, 20)
+
+    dut.sys_rst.value = 0
+    dut.pcie_rst.value = 0
+    dut.usb_rst.value = 0
+
+    await ClockCycles(dut.sys_clk, 50)
+
+    _reset_duts.add(id(dut))
+    return "full"
+
+
+async def start_test(dut, mode: str = "full", soft_writes=(),
+                     sys_clk_period_ns: int = 8):
+    """
+    Reset the DUT and build the BFMs for a test.
+
+    Both BFMs are built per test: building the PCIe BFM drives the PHY
+    back to idle, which a soft reset relies on, and the USB BFM's
+    background capture task is cancelled along with the test that
+    started it.
+
+    A soft reset skips the reset pulse and settling time. Instead the
+    monitor is disabled with its statistics cleared, soft_writes are
+    applied in the same Etherbone write burst (one packet per run of
+    consecutive addresses), and any monitor packets still streaming out
+    from an earlier test are discarded. Unlike a full
+    reset, which comes up with RX and TX monitoring enabled, the monitor
+    is left disabled; tests enable it as needed.
+
+    Args:
+        dut: Testbench DUT
+        mode: "full" or "soft", see reset_dut()
+        soft_writes: Extra (CSR address, value) pairs that clear
+            module-specific state after a soft reset
+        sys_clk_period_ns: sys_clk period in ns
+
+    Returns:
+        (usb_bfm, pcie_bfm) tuple
+    """
+    applied = await reset_dut(dut, mode, sys_clk_period_ns)
+    usb_bfm = USBBFM(dut, clk_period_ns=sys_clk_period_ns)
+    pcie_bfm = PCIeBFM(dut, clk_period_ns=sys_clk_period_ns)
+
+    if applied == "soft":
+        await usb_bfm.send_etherbone_write_burst([
+            (REG_USB_MON_CTRL, 0x04),   # Disable + clear monitor
+            *soft_writes,
+        ])
+        while await usb_bfm.receive_monitor_packet(timeout_cycles=100) is not None:
+            pass
+
+    return usb_bfm, pcie_bfm
@@ -53,6 +53,9 @@ ATS Translation Completion permission bits (bits [5:0]):
 - Bit 5: N (No-snoop attribute)
 """
 
+import functools
+import struct
+
 # ATS Translation Completion permission bit constants
 ATS_PERM_R     = 0x01  # Read permission
 ATS_PERM_W     = 0x02  # Write permission
@@ -83,6 +86,41 @@ ATS_PERM_RW_PRIV     = ATS_PERM_R | ATS_PERM_W | ATS_PERM_PRIV    # 0x07: Read +
 # For int input:    Use dword_to_wire() below
 #
 
+# Data DWORD in wire order, compiled once and reused for every payload
+_WIRE_DWORD = struct.Struct('>I')
+
+# Two wire-order data DWORDs making up one 64-bit beat
+_WIRE_DWORD_PAIR = struct.Struct('>II')
+
+# ATS Translation Completion data: lower/upper DWORDs, little endian
+_ATS_CPL_DATA = struct.Struct('<II')
+
+
+def _pad_dwords(data_bytes: bytes) -> bytes:
+    """Pad a payload to a DWORD boundary."""
+    if len(data_bytes) % 4:
+        data_bytes += bytes(4 - len(data_bytes) % 4)
+    return data_bytes
+
+
+def _wire_beats(data: bytes, partial_be: int = 0x0F) -> list[dict]:
+    """
+    Split a DWORD-padded payload into 64-bit data beats.
+
+    Each pair of wire-order DWORDs is unpacked with one precompiled struct
+    call, lower address DWORD in [31:0]. An odd trailing DWORD is padded
+    with zero and its beat gets partial_be.
+    """
+    odd = len(data) % 8
+    if odd:
+        data += bytes(4)
+    beats = [{'dat': (dw_b << 32) | dw_a, 'be': 0xFF}
+             for dw_a, dw_b in _WIRE_DWORD_PAIR.iter_unpack(data)]
+    if odd:
+        beats[-1]['be'] = partial_be
+    return beats
+
+
 def dword_to_wire(value: int) -> int:
     """
     Convert a 32-bit integer to wire format for LitePCIe big-endian mode.
@@ -137,29 +175,66 @@ class TLPBuilder:
         # Beat 0: DW0 (lower), DW1 (upper) - LitePCIe expects DW0 in lower 32 bits
         beats.append({'dat': (dw1 << 32) | dw0, 'be': 0xFF})
 
-        # Pad data to DWORD boundary
-        padded_data = data_bytes + b'\x00' * (4 - len(data_bytes) % 4) if len(data_bytes) % 4 else data_bytes
+        # Data DWORDs in big-endian wire format (depacketizer will byte-swap to little-endian)
+        data = _pad_dwords(data_bytes)
 
         # Beat 1: DW2 (lower), first data DWORD (upper)
-        # Use 'big' to put data in big-endian wire format (depacketizer will byte-swap to little-endian)
-        data_dw0 = int.from_bytes(padded_data[0:4], 'big')
+        data_dw0 = _WIRE_DWORD.unpack_from(data)[0] if data else 0
         beats.append({'dat': (data_dw0 << 32) | dw2, 'be': 0xFF})
 
-        # Additional data beats as needed
-        for i in range(4, len(padded_data), 8):
-            dw_a = int.from_bytes(padded_data[i:i+4], 'big') if i < len(padded_data) else 0
-            dw_b = int.from_bytes(padded_data[i+4:i+8], 'big') if i+4 < len(padded_data) else 0
-            be = 0xFF
-            if i + 8 > len(padded_data):
-                # Partial last beat - lower DWORD only
-                remaining = len(padded_data) - i
-                if remaining <= 4:
-                    be = 0x0F  # Only lower 4 bytes valid
-            # Lower address DWORD in [31:0], higher in [63:32]
-            beats.append({'dat': (dw_b << 32) | dw_a, 'be': be})
+        # Additional data beats as needed; a partial last beat has only
+        # its lower 4 bytes valid
+        beats.extend(_wire_beats(data[4:]))
 
         return beats
 
+    @staticmethod
+    def make_memory_write_32_template(requester_id=0x0100, attr=0, at=0, first_be=None):
+        """
+        Build a reusable single-DWORD 32-bit Memory Write TLP.
+
+        The header fields that stay constant across a run of writes are baked
+        in once; use patch_memory_write_32() to fill in the per-write address,
+        data and tag before each injection.
+
+        Args:
+            requester_id: 16-bit requester ID
+            attr: 2-bit attribute field [1]=Relaxed Ordering, [0]=No Snoop
+            at: 2-bit address type (0=untranslated, 1=trans req, 2=translated)
+            first_be: 4-bit byte enable for the data DWORD (default: 0xF)
+
+        Returns:
+            List of beat dicts with 'dat' and 'be' keys
+        """
+        return TLPBuilder.memory_write_32(
+            address=0,
+            data_bytes=bytes(4),
+            requester_id=requester_id,
+            tag=0,
+            attr=attr,
+            at=at,
+            first_be=first_be,
+        )
+
+    @staticmethod
+    def patch_memory_write_32(template, address, data, tag):
+        """
+        Update a template from make_memory_write_32_template() in place.
+
+        Args:
+            template: Beat list returned by make_memory_write_32_template()
+            address: 32-bit target address (must be DWORD-aligned)
+            data: 32-bit data value (as it should appear in the register)
+            tag: 8-bit tag
+
+        Returns:
+            The patched template, ready to pass to inject_tlp()
+        """
+        hdr = template[0]
+        hdr['dat'] = (hdr['dat'] & ~(0xFF << 40)) | ((tag & 0xFF) << 40)
+        template[1]['dat'] = (dword_to_wire(data) << 32) | (address & 0xFFFFFFFC)
+        return template
+
     @staticmethod
     def memory_read_32(address, length_dw, requester_id=0x0100, tag=0, attr=0, at=0,
                        first_be=None, last_be=None):
@@ -197,6 +272,81 @@ class TLPBuilder:
             {'dat': (0 << 32) | dw2, 'be': 0x0F},        # DW2 lower, only lower 4 bytes valid
         ]
 
+    @staticmethod
+    def make_memory_read_32_template(length_dw=1, requester_id=0x0100, attr=0, at=0):
+        """
+        Build a reusable 32-bit Memory Read TLP.
+
+        Counterpart of make_memory_write_32_template(): use
+        patch_memory_read_32() to fill in the per-read address and tag.
+
+        Args:
+            length_dw: Length in DWORDs to read
+            requester_id: 16-bit requester ID
+            attr: 2-bit attribute field [1]=Relaxed Ordering, [0]=No Snoop
+            at: 2-bit address type (0=untranslated, 1=trans req, 2=translated)
+
+        Returns:
+            List of beat dicts with 'dat' and 'be' keys
+        """
+        return TLPBuilder.memory_read_32(
+            address=0,
+            length_dw=length_dw,
+            requester_id=requester_id,
+            tag=0,
+            attr=attr,
+            at=at,
+        )
+
+    @staticmethod
+    def patch_memory_read_32(template, address, tag):
+        """
+        Update a template from make_memory_read_32_template() in place.
+
+        Args:
+            template: Beat list returned by make_memory_read_32_template()
+            address: 32-bit target address (must be DWORD-aligned)
+            tag: 8-bit tag
+
+        Returns:
+            The patched template, ready to pass to inject_tlp()
+        """
+        hdr = template[0]
+        hdr['dat'] = (hdr['dat'] & ~(0xFF << 40)) | ((tag & 0xFF) << 40)
+        template[1]['dat'] = address & 0xFFFFFFFC
+        return template
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def memory_read_32_cached(address, length_dw=1, requester_id=0x0100, tag=0,
+                              attr=0, at=0):
+        """
+        Memoized memory_read_32() for register reads that repeat.
+
+        Register polling and fixed permutation tables reuse a handful of
+        header values, so the beats are built once and shared. The returned
+        beats are shared between callers and must not be modified.
+
+        Args:
+            address: 32-bit target address (must be DWORD-aligned)
+            length_dw: Length in DWORDs to read
+            requester_id: 16-bit requester ID
+            tag: 8-bit tag
+            attr: 2-bit attribute field [1]=Relaxed Ordering, [0]=No Snoop
+            at: 2-bit address type (0=untranslated, 1=trans req, 2=translated)
+
+        Returns:
+            Tuple of beat dicts with 'dat' and 'be' keys
+        """
+        return tuple(TLPBuilder.memory_read_32(
+            address=address,
+            length_dw=length_dw,
+            requester_id=requester_id,
+            tag=tag,
+            attr=attr,
+            at=at,
+        ))
+
     @staticmethod
     def completion(requester_id, completer_id, tag, data_bytes, status=0, lower_addr=0):
         """
@@ -229,23 +379,63 @@ class TLPBuilder:
         # Beat 0: DW0 (lower), DW1 (upper) - LitePCIe expects DW0 in lower 32 bits
         beats.append({'dat': (dw1 << 32) | dw0, 'be': 0xFF})
 
-        # Pad data to DWORD boundary
-        padded_data = data_bytes + b'\x00' * (4 - len(data_bytes) % 4) if len(data_bytes) % 4 else data_bytes
+        # Data DWORDs in big-endian wire format (depacketizer will byte-swap to little-endian)
+        data = _pad_dwords(data_bytes)
 
         # Beat 1: DW2 (lower), first data DWORD (upper)
-        # Use 'big' to put data in big-endian wire format (depacketizer will byte-swap to little-endian)
-        data_dw0 = int.from_bytes(padded_data[0:4], 'big')
+        data_dw0 = _WIRE_DWORD.unpack_from(data)[0] if data else 0
         beats.append({'dat': (data_dw0 << 32) | dw2, 'be': 0xFF})
 
         # Additional data beats as needed
-        for i in range(4, len(padded_data), 8):
-            dw_a = int.from_bytes(padded_data[i:i+4], 'big') if i < len(padded_data) else 0
-            dw_b = int.from_bytes(padded_data[i+4:i+8], 'big') if i+4 < len(padded_data) else 0
-            # Lower address DWORD in [31:0], higher in [63:32]
-            beats.append({'dat': (dw_b << 32) | dw_a, 'be': 0xFF})
+        beats.extend(_wire_beats(data[4:], partial_be=0xFF))
 
         return beats
 
+    @staticmethod
+    def make_completion_template(requester_id, completer_id, data_bytes,
+                                 status=0, lower_addr=0):
+        """
+        Build a reusable Completion with Data TLP.
+
+        Counterpart of make_memory_read_32_template(): use patch_completion()
+        to fill in the tag of the request being completed.
+
+        Args:
+            requester_id: 16-bit requester ID (who requested)
+            completer_id: 16-bit completer ID (who is responding)
+            data_bytes: bytes object with completion data
+            status: Completion status (0=SC, 1=UR, 2=CRS, 4=CA)
+            lower_addr: Lower 7 bits of byte address
+
+        Returns:
+            List of beat dicts with 'dat' and 'be' keys
+        """
+        return TLPBuilder.completion(
+            requester_id=requester_id,
+            completer_id=completer_id,
+            tag=0,
+            data_bytes=data_bytes,
+            status=status,
+            lower_addr=lower_addr,
+        )
+
+    @staticmethod
+    def patch_completion(template, tag):
+        """
+        Update a template from make_completion_template() in place.
+
+        Args:
+            template: Beat list returned by make_completion_template()
+            tag: 8-bit tag from original request
+
+        Returns:
+            The patched template, ready to pass to inject_tlp()
+        """
+        # Tag is DW2[15:8], and DW2 sits in the lower half of beat 1
+        beat = template[1]
+        beat['dat'] = (beat['dat'] & ~(0xFF << 8)) | ((tag & 0xFF) << 8)
+        return template
+
     @staticmethod
     def ats_translation_completion(requester_id, completer_id, tag,
                                    translated_addr, s_field=0, permissions=ATS_PERM_RW):
@@ -282,10 +472,34 @@ class TLPBuilder:
         upper_dw = (translated_addr >> 32) & 0xFFFFFFFF
 
         # Pack as 8 bytes (little endian for LitePCIe data path)
-        data_bytes = lower_dw.to_bytes(4, 'little') + upper_dw.to_bytes(4, 'little')
+        data_bytes = _ATS_CPL_DATA.pack(lower_dw, upper_dw)
 
         return TLPBuilder.completion(requester_id, completer_id, tag, data_bytes)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def ats_translation_completion_cached(requester_id, completer_id, tag,
+                                         translated_addr, s_field=0,
+                                         permissions=ATS_PERM_RW):
+        """
+        Memoized ats_translation_completion().
+
+        ATC population repeats a small set of (tag, translated_addr)
+        combinations. The returned beats are shared between callers and
+        must not be modified.
+
+        Returns:
+            Tuple of beat dicts with 'dat' and 'be' keys
+        """
+        return tuple(TLPBuilder.ats_translation_completion(
+            requester_id=requester_id,
+            completer_id=completer_id,
+            tag=tag,
+            translated_addr=translated_addr,
+            s_field=s_field,
+            permissions=permissions,
+        ))
+
     @staticmethod
     def extract_address_from_mwr(beats):
         """
@@ -383,19 +597,8 @@ class TLPBuilder:
         # Beat 1: DW2 (lower), DW3 (upper)
         beats.append({'dat': (dw3 << 32) | dw2, 'be': 0xFF})
 
-        # Pad data to DWORD boundary
-        padded_data = data_bytes + b'\x00' * (4 - len(data_bytes) % 4) if len(data_bytes) % 4 else data_bytes
-
         # Beat 2+: Data DWORDs
-        for i in range(0, len(padded_data), 8):
-            dw_a = int.from_bytes(padded_data[i:i+4], 'big') if i < len(padded_data) else 0
-            dw_b = int.from_bytes(padded_data[i+4:i+8], 'big') if i+4 < len(padded_data) else 0
-            be = 0xFF
-            if i + 8 > len(padded_data):
-                remaining = len(padded_data) - i
-                if remaining <= 4:
-                    be = 0x0F  # Only lower 4 bytes valid
-            beats.append({'dat': (dw_b << 32) | dw_a, 'be': be})
+        beats.extend(_wire_beats(_pad_dwords(data_bytes)))
 
         return beats
 
@@ -602,6 +805,29 @@ class TLPBuilder:
 
         return beats
 
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def ats_invalidation_request_cached(requester_id, device_id, itag, address,
+                                        s_bit=0, g_bit=0, tag=0):
+        """
+        Memoized ats_invalidation_request().
+
+        The returned beats are shared between callers and must not be
+        modified.
+
+        Returns:
+            Tuple of beat dicts with 'dat' and 'be' keys
+        """
+        return tuple(TLPBuilder.ats_invalidation_request(
+            requester_id=requester_id,
+            device_id=device_id,
+            itag=itag,
+            address=address,
+            s_bit=s_bit,
+            g_bit=g_bit,
+            tag=tag,
+        ))
+
     @staticmethod
     def extract_requester_id_from_tlp(beats):
         """
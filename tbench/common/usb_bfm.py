@@ -13,7 +13,8 @@ from collections import deque
 from typing import Optional
 
 import cocotb
-from cocotb.triggers import ClockCycles, RisingEdge, with_timeout, Event
+from cocotb.triggers import ClockCycles, RisingEdge, with_timeout, Event, First
+from cocotb.utils import get_sim_time
 
 
 # =============================================================================
@@ -32,6 +33,9 @@ USB_CHANNEL_MONITOR = 1
 ETHERBONE_MAGIC = 0x4e6f
 ETHERBONE_VERSION = 1
 
+# Base address + data words of a single-write record (big-endian)
+_EB_ADDR_DATA = struct.Struct('>II')
+
 # Etherbone packet header (8 bytes)
 # Byte 0-1: magic (big-endian)
 # Byte 2: version[7:4], reserved[3], nr[2], pr[1], pf[0]
@@ -59,25 +63,41 @@ class USBBFM:
     - Etherbone CSR read/write operations
     """
 
-    def __init__(self, dut, sys_clk_name="sys_clk"):
+    # USB stub signals (exposed at top level), as attribute -> signal name
+    _SIGNALS = {
+        'inject_valid': 'usb_inject_valid',
+        'inject_ready': 'usb_inject_ready',
+        'inject_data': 'usb_inject_data',
+        'capture_valid': 'usb_capture_valid',
+        'capture_ready': 'usb_capture_ready',
+        'capture_data': 'usb_capture_data',
+        'tx_backpressure': 'usb_tx_backpressure',
+    }
+
+    # Resolved signal handles per DUT, shared by every BFM built in the
+    # same simulation so the hierarchy is only walked once
+    _handle_cache = {}
+
+    def __init__(self, dut, sys_clk_name="sys_clk", clk_period_ns=8):
         """
         Args:
             dut: Testbench DUT with exposed USB signals
             sys_clk_name: Name of system clock signal
+            clk_period_ns: System clock period, used to turn cycle timeouts
+                into a simulation-time deadline
         """
         self.dut = dut
-        self.clk = getattr(dut, sys_clk_name)
-
-        # USB stub signals (exposed at top level)
-        self.inject_valid = dut.usb_inject_valid
-        self.inject_ready = dut.usb_inject_ready
-        self.inject_data = dut.usb_inject_data
+        self.clk_period_ns = clk_period_ns
 
-        self.capture_valid = dut.usb_capture_valid
-        self.capture_ready = dut.usb_capture_ready
-        self.capture_data = dut.usb_capture_data
+        handles = self._handle_cache.setdefault(id(dut), {})
+        if sys_clk_name not in handles:
+            handles[sys_clk_name] = getattr(dut, sys_clk_name)
+            for name in self._SIGNALS.values():
+                handles.setdefault(name, getattr(dut, name))
 
-        self.tx_backpressure = dut.usb_tx_backpressure
+        self.clk = handles[sys_clk_name]
+        for attr, name in self._SIGNALS.items():
+            setattr(self, attr, handles[name])
 
         # Initialize signals
         self.inject_valid.value = 0
@@ -90,6 +110,15 @@ class USBBFM:
         self._data_available = Event()
         # Buffer for non-Etherbone packets received during Etherbone operations
         self._pending_monitor_packets = deque()
+        # Last value written by send_etherbone_write_changed(), per address
+        self._eb_shadow = {}
+        # Header and record of a single write never change, so keep one
+        # packet around and only patch the address/data words per write
+        self._eb_header = self._build_etherbone_packet()
+        self._eb_write_buf = bytearray(
+            self._eb_header
+            + self._build_etherbone_record(wcount=1, rcount=0)
+            + bytes(_EB_ADDR_DATA.size))
         # Start background capture automatically
         self._capture_task = cocotb.start_soon(self._background_capture())
 
@@ -134,14 +163,14 @@ class USBBFM:
 
     async def _capture_word(self, timeout_cycles: int = 1000) -> Optional[int]:
         """Get next word from capture queue, waiting if necessary."""
-        for _ in range(timeout_cycles):
-            word = self._get_queued_word()
-            if word is not None:
-                return word
-            # Wait for data to arrive
-            self._data_available.clear()
-            await RisingEdge(self.clk)
-        return None
+        word = self._get_queued_word()
+        if word is not None:
+            return word
+        # Sleep until the background task queues data or the timeout
+        # expires, rather than waking on every clock edge
+        self._data_available.clear()
+        await First(self._data_available.wait(), ClockCycles(self.clk, timeout_cycles))
+        return self._get_queued_word()
 
     async def send_packet(self, channel: int, data: bytes):
         """
@@ -157,9 +186,11 @@ class USBBFM:
         - Length: 32-bit (payload length in bytes)
         - Payload: data bytes (padded to 32-bit boundary)
         """
-        # Pad to 32-bit boundary
+        # Pad to 32-bit boundary. This copies data before the first await,
+        # so callers may reuse their buffer once the call has started.
         padding = (4 - (len(data) % 4)) % 4
         padded_data = data + bytes(padding)
+        words = struct.unpack(f'<{len(padded_data) // 4}I', padded_data)
 
         # Send frame header
         await self._inject_word(USB_PREAMBLE)
@@ -167,8 +198,7 @@ class USBBFM:
         await self._inject_word(len(data))  # Original length, not padded
 
         # Send payload words
-        for i in range(0, len(padded_data), 4):
-            word = struct.unpack('<I', padded_data[i:i+4])[0]
+        for word in words:
             await self._inject_word(word)
 
     async def receive_packet(self, timeout_cycles: int = 1000, debug: bool = False) -> Optional[tuple[int, bytes]]:
@@ -182,26 +212,29 @@ class USBBFM:
         Returns:
             (channel, data) tuple, or None on timeout
         """
-        from cocotb.utils import get_sim_time
+        start_ns = get_sim_time('ns')
         if debug:
-            self.dut._log.info(f"[BFM] receive_packet called at {get_sim_time('ns')}ns, queue size={len(self._capture_queue)}")
-        # Wait for preamble from capture queue
+            self.dut._log.info(f"[BFM] receive_packet called at {start_ns}ns, queue size={len(self._capture_queue)}")
+        # Wait for preamble from capture queue. Discarded words share one
+        # deadline, so each wait only gets what is left of the timeout.
+        deadline_ns = start_ns + timeout_cycles * self.clk_period_ns
+        remaining = timeout_cycles
         preamble_found = False
         debug_count = 0
-        for i in range(timeout_cycles):
-            word = self._get_queued_word()
-            if word is not None:
-                if debug and debug_count < 5:
-                    self.dut._log.info(f"receive_packet iter {i}: data=0x{word:08X}")
-                    debug_count += 1
-                if word == USB_PREAMBLE:
-                    preamble_found = True
-                    break
-                # Not preamble - discard and continue looking
-            else:
-                # No data available, wait for next cycle
-                self._data_available.clear()
-                await RisingEdge(self.clk)
+        i = 0
+        while remaining > 0:
+            word = await self._capture_word(remaining)
+            if word is None:
+                break
+            if debug and debug_count < 5:
+                self.dut._log.info(f"receive_packet iter {i}: data=0x{word:08X}")
+                debug_count += 1
+            if word == USB_PREAMBLE:
+                preamble_found = True
+                break
+            # Not preamble - discard and continue looking
+            i += 1
+            remaining = int((deadline_ns - get_sim_time('ns')) // self.clk_period_ns)
 
         if not preamble_found:
             if debug:
@@ -220,14 +253,15 @@ class USBBFM:
 
         # Read payload words
         num_words = (length + 3) // 4
-        payload = b''
+        words = []
         for _ in range(num_words):
             word = await self._capture_word(timeout_cycles)
             if word is None:
                 return None
-            payload += struct.pack('<I', word)
+            words.append(word)
 
-        # Trim to actual length
+        # Pack in one go and trim to actual length
+        payload = struct.pack(f'<{num_words}I', *words)
         return (channel, payload[:length])
 
     # =========================================================================
@@ -262,6 +296,12 @@ class USBBFM:
         # Byte 3: rcount
         return bytes([byte0, byte_enable, wcount, rcount])
 
+    def _build_etherbone_write(self, base_address: int, values: list[int]) -> bytes:
+        """Build Etherbone write packet: header + record + base_addr + data."""
+        return (self._eb_header
+                + self._build_etherbone_record(wcount=len(values), rcount=0)
+                + struct.pack(f'>{len(values) + 1}I', base_address, *values))
+
     async def send_etherbone_probe(self):
         """
         Send Etherbone probe request.
@@ -364,17 +404,11 @@ class USBBFM:
             data: 32-bit value to write
             timeout_cycles: Cycles to wait after sending (for write to complete)
         """
-        # Build packet: header + record + base_addr + data
-        packet = self._build_etherbone_packet()
-        packet += self._build_etherbone_record(wcount=1, rcount=0)
+        self._eb_shadow.pop(address, None)
 
-        # Base address (big-endian)
-        packet += struct.pack('>I', address)
-
-        # Write data (big-endian)
-        packet += struct.pack('>I', data)
-
-        await self.send_packet(USB_CHANNEL_ETHERBONE, packet)
+        # Patch base_addr + data into the prebuilt header + record
+        _EB_ADDR_DATA.pack_into(self._eb_write_buf, 12, address, data)
+        await self.send_packet(USB_CHANNEL_ETHERBONE, self._eb_write_buf)
 
         # Allow some cycles for the write to propagate
         await ClockCycles(self.clk, 10)
@@ -395,15 +429,10 @@ class USBBFM:
             return []
 
         # Build packet: header + record + base_addr + read_addrs...
-        packet = self._build_etherbone_packet()
-        packet += self._build_etherbone_record(wcount=0, rcount=len(addresses))
-
-        # Base return address (not used)
-        packet += struct.pack('>I', 0)
-
-        # Read addresses (big-endian)
-        for addr in addresses:
-            packet += struct.pack('>I', addr)
+        # Base return address is not used; addresses are big-endian
+        packet = (self._eb_header
+                  + self._build_etherbone_record(wcount=0, rcount=len(addresses))
+                  + struct.pack(f'>{len(addresses) + 1}I', 0, *addresses))
 
         await self.send_packet(USB_CHANNEL_ETHERBONE, packet)
 
@@ -452,21 +481,69 @@ class USBBFM:
         if not values:
             return
 
-        # Build packet: header + record + base_addr + data...
-        packet = self._build_etherbone_packet()
-        packet += self._build_etherbone_record(wcount=len(values), rcount=0)
+        for i in range(len(values)):
+            self._eb_shadow.pop(base_address + 4 * i, None)
 
-        # Base address (big-endian)
-        packet += struct.pack('>I', base_address)
+        await self.send_packet(USB_CHANNEL_ETHERBONE,
+                               self._build_etherbone_write(base_address, values))
 
-        # Write data (big-endian)
-        for val in values:
-            packet += struct.pack('>I', val)
+        # Allow some cycles for the writes to propagate
+        await ClockCycles(self.clk, 10 + len(values) * 2)
 
-        await self.send_packet(USB_CHANNEL_ETHERBONE, packet)
+    async def send_etherbone_write_burst(self, pairs: list[tuple[int, int]],
+                                          timeout_cycles: int = 1000):
+        """
+        Write a sequence of (address, value) pairs back-to-back.
+
+        Runs of consecutive addresses are packed into a single Etherbone
+        record. Each record goes out in its own packet (the record layer
+        handles one record per packet), but the packets are streamed
+        without the per-write settle delay of send_etherbone_write(), which
+        is paid once at the end. Writes are issued in list order.
+
+        Args:
+            pairs: List of (CSR address, 32-bit value) tuples
+            timeout_cycles: Cycles to wait after sending
+        """
+        if not pairs:
+            return
+
+        # Group into runs of consecutive addresses, preserving order
+        runs = []
+        for address, value in pairs:
+            self._eb_shadow.pop(address, None)
+            if runs and address == runs[-1][0] + 4 * len(runs[-1][1]):
+                runs[-1][1].append(value)
+            else:
+                runs.append((address, [value]))
+
+        for base_address, values in runs:
+            await self.send_packet(USB_CHANNEL_ETHERBONE,
+                                   self._build_etherbone_write(base_address, values))
 
         # Allow some cycles for the writes to propagate
-        await ClockCycles(self.clk, 10 + len(values) * 2)
+        await ClockCycles(self.clk, 10 + len(pairs) * 2)
+
+    async def send_etherbone_write_changed(self, pairs: list[tuple[int, int]],
+                                            timeout_cycles: int = 1000):
+        """
+        Write (address, value) pairs, skipping any that are already set.
+
+        Remembers the last value this method wrote to each address and
+        leaves out pairs whose value has not changed since. The rest go
+        out through send_etherbone_write_burst(). Only use this for plain
+        storage registers, such as DMA parameters, that have no side
+        effects when written and are not changed by the hardware. Any
+        other write to an address forgets its remembered value.
+
+        Args:
+            pairs: List of (CSR address, 32-bit value) tuples
+            timeout_cycles: Cycles to wait after sending
+        """
+        shadow = self._eb_shadow
+        changed = [(a, v) for a, v in pairs if shadow.get(a) != v]
+        await self.send_etherbone_write_burst(changed, timeout_cycles)
+        shadow.update(changed)
 
     # =========================================================================
     # Monitor Packet Operations
@@ -495,6 +572,57 @@ class USBBFM:
 
         return data
 
+    async def capture_n(self, n: int, idle_cycles: int = 500) -> list[bytes]:
+        """
+        Capture up to n TLP monitor packets.
+
+        Instead of polling every cycle, sleeps on the capture event until
+        the background task queues data, then drains whole packets. Stops
+        early once the stream has been idle for idle_cycles.
+
+        Args:
+            n: Maximum number of packets to capture
+            idle_cycles: Cycles without new data before giving up
+
+        Returns:
+            List of raw monitor packets (may be shorter than n)
+        """
+        packets = [None] * n
+        count = await self.drain_into(packets, idle_cycles=idle_cycles)
+        del packets[count:]
+        return packets
+
+    async def drain_into(self, buf: list, idle_cycles: int = 500) -> int:
+        """
+        Capture TLP monitor packets into a caller-allocated buffer.
+
+        Fills buf from index 0 with raw monitor packets, stopping when it
+        is full or the stream has been idle for idle_cycles. The buffer can
+        be reused across calls, so long soak captures don't grow a list.
+
+        Args:
+            buf: Preallocated list; its length is the packet limit
+            idle_cycles: Cycles without new data before giving up
+
+        Returns:
+            Number of packets written to buf
+        """
+        count = 0
+        while count < len(buf):
+            if not self._pending_monitor_packets and not self._capture_queue:
+                self._data_available.clear()
+                await First(self._data_available.wait(), ClockCycles(self.clk, idle_cycles))
+                if not self._capture_queue:
+                    break
+
+            data = await self.receive_monitor_packet(timeout_cycles=idle_cycles)
+            if data is None:
+                break
+            buf[count] = data
+            count += 1
+
+        return count
+
     # =========================================================================
     # Backpressure Control
     # =========================================================================
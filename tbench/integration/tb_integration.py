@@ -80,6 +80,13 @@ class IntegrationTestbench(LiteXModule):
         # PHY stub always accepts (ready=1), so we just expose the latched state
         self.intx_asserted = Signal(name="intx_asserted")  # Latched state in PHY
 
+        # Transaction monitor status (DUT -> testbench)
+        # Observation-only copies of the TXN_CTRL status fields so tests can
+        # sample them without a BAR0 read round-trip
+        self.txn_mon_enable   = Signal(name="txn_mon_enable")
+        self.txn_mon_overflow = Signal(name="txn_mon_overflow")
+        self.txn_mon_count    = Signal(8, name="txn_mon_count")
+
         # Wire external signals to PHY stub
         self.comb += [
             # RX: testbench -> PHY source -> endpoint (via depacketizer)
@@ -101,6 +108,11 @@ class IntegrationTestbench(LiteXModule):
 
             # INTx: PHY latched state -> testbench
             self.intx_asserted.eq(self.phy.intx_asserted),
+
+            # Transaction monitor status -> testbench
+            self.txn_mon_enable.eq(self.soc.txn_monitor.enable),
+            self.txn_mon_overflow.eq(self.soc.txn_monitor.overflow),
+            self.txn_mon_count.eq(self.soc.txn_monitor.count),
         ]
 
 
@@ -129,6 +141,10 @@ def generate_verilog():
         testbench.phy_tx_dat, testbench.phy_tx_be,
         # INTx
         testbench.intx_asserted,
+        # Transaction monitor status
+        testbench.txn_mon_enable,
+        testbench.txn_mon_overflow,
+        testbench.txn_mon_count,
     }
 
     output = convert(testbench, ios=ios, name="tb_integration")
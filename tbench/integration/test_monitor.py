@@ -15,10 +15,11 @@ as the exerciser must be able to observe host-initiated transactions.
 
 import sys
 import os
+import logging
 
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, ClockCycles
+from cocotb.triggers import RisingEdge, ClockCycles, Combine, Timer
 
 # Add parent directories to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -27,12 +28,15 @@ from tbench.common.pcie_bfm import PCIeBFM
 from tbench.common.tlp_builder import TLPBuilder
 
 
+SYS_CLK_PERIOD_NS = 8  # 125 MHz
+
+
 # =============================================================================
 # Register Offsets
 # =============================================================================
 
 REG_TXN_TRACE = 0x40   # Transaction FIFO read data (RO)
-REG_TXN_CTRL  = 0x44   # Transaction control:
+REG_TXN_CTRL  = 0x44   # Transaction control (accesses are not captured):
                        #   [0] = enable (R/W)
                        #   [1] = clear (W1C, always reads 0)
                        #   [2] = overflow (RO, sticky until clear)
@@ -60,29 +64,45 @@ REG_TXN_CTRL  = 0x44   # Transaction control:
 # =============================================================================
 
 async def reset_dut(dut):
-    """Reset the DUT."""
+    """
+    Reset the DUT.
+
+    Holds reset for 10 sys_clk cycles and then lets the design settle for
+    another 10. Each wait is a single Timer rather than a ClockCycles count,
+    so there is one wake-up instead of one per clock edge.
+    """
     dut.sys_rst.value = 1
-    await ClockCycles(dut.sys_clk, 10)
+    await Timer(10 * SYS_CLK_PERIOD_NS, unit="ns")
     dut.sys_rst.value = 0
-    await ClockCycles(dut.sys_clk, 10)
+    await Timer(10 * SYS_CLK_PERIOD_NS, unit="ns")
 
 
 async def write_bar0_register(bfm, offset, data):
     """Write a 32-bit value to a BAR0 register."""
-    data_bytes = data.to_bytes(4, 'little')
-    beats = TLPBuilder.memory_write_32(
-        address=offset,
-        data_bytes=data_bytes,
-        requester_id=0x0100,
-        tag=0,
-    )
-    await bfm.inject_tlp(beats, bar_hit=0b000001)
+    await write_bar0_registers_burst(bfm, [(offset, data)])
+
+
+async def write_bar0_registers_burst(bfm, pairs):
+    """
+    Write several 32-bit BAR0 registers back-to-back.
+
+    Memory writes are posted, so the TLPs are streamed onto the PHY without
+    an idle gap between them and a single settling wait follows the burst.
+
+    Args:
+        bfm: PCIeBFM instance
+        pairs: Iterable of (offset, data) tuples, written in order
+    """
+    beats = TLPBuilder.make_memory_write_32_template(requester_id=0x0100)
+    for offset, data in pairs:
+        TLPBuilder.patch_memory_write_32(beats, offset, data, 0)
+        await bfm.inject_tlp(beats, bar_hit=0b000001)
     await ClockCycles(bfm.clk, 5)
 
 
 async def read_bar0_register(bfm, offset, tag=0):
     """Read a 32-bit value from a BAR0 register."""
-    beats = TLPBuilder.memory_read_32(
+    beats = TLPBuilder.memory_read_32_cached(
         address=offset,
         length_dw=1,
         requester_id=0x0100,
@@ -94,6 +114,11 @@ async def read_bar0_register(bfm, offset, tag=0):
     if cpl is None:
         return None
 
+    return completion_data(cpl)
+
+
+def completion_data(cpl):
+    """Extract the first data DWORD from a captured completion."""
     # Extract data from completion (big-endian wire format)
     raw_data = (cpl[1]['dat'] >> 32) & 0xFFFFFFFF
     return int.from_bytes(raw_data.to_bytes(4, 'big'), 'little')
@@ -116,22 +141,68 @@ async def read_txn_ctrl_status(bfm, tag=0):
     }
 
 
+def peek_txn_ctrl_status(dut):
+    """
+    Sample the TXN_CTRL status fields directly from the monitor.
+
+    Uses the txn_mon_* observation ports exposed by tb_integration instead of
+    a BAR0 read, so it costs no TLP round-trip. Only use this where the test
+    isn't exercising the register read path itself, e.g. once capture has
+    been disabled.
+
+    Returns:
+        Dict with 'enable', 'overflow', 'count' fields.
+    """
+    return {
+        'enable': int(dut.txn_mon_enable.value),
+        'overflow': int(dut.txn_mon_overflow.value),
+        'count': int(dut.txn_mon_count.value),
+    }
+
+
 async def read_fifo_transaction(bfm):
     """
     Read a complete transaction from the monitor FIFO (5 words).
 
+    The five TXN_TRACE reads are pipelined: one coroutine streams the MRd
+    requests into the RX path while another drains the completions from the
+    TX path, rather than waiting for each completion before the next read.
+    Reads of an empty FIFO don't advance the read pointer, so the trailing
+    reads are harmless when the FIFO turns out to be empty.
+
     Returns:
         Dict with parsed transaction fields, or None if FIFO empty.
     """
-    words = []
-    for i in range(5):
-        word = await read_bar0_register(bfm, REG_TXN_TRACE, tag=0x20 + i)
-        if word is None:
-            return None
-        # 0xFFFFFFFF indicates empty FIFO
-        if i == 0 and word == 0xFFFFFFFF:
-            return None
-        words.append(word)
+    async def _inject_reads():
+        for i in range(5):
+            beats = TLPBuilder.memory_read_32_cached(
+                address=REG_TXN_TRACE,
+                length_dw=1,
+                requester_id=0x0100,
+                tag=0x20 + i,
+            )
+            await bfm.inject_tlp(beats, bar_hit=0b000001)
+
+    async def _drain_completions():
+        cpls = []
+        for _ in range(5):
+            cpl = await bfm.capture_tlp(timeout_cycles=200)
+            if cpl is None:
+                break
+            cpls.append(cpl)
+        return cpls
+
+    drain_task = cocotb.start_soon(_drain_completions())
+    inject_task = cocotb.start_soon(_inject_reads())
+    await Combine(inject_task, drain_task)
+    cpls = await drain_task
+
+    if len(cpls) < 5:
+        return None
+    words = [completion_data(cpl) for cpl in cpls]
+    # 0xFFFFFFFF indicates empty FIFO
+    if words[0] == 0xFFFFFFFF:
+        return None
 
     # Parse word 0 (attributes)
     w0 = words[0]
@@ -167,6 +238,31 @@ async def read_fifo_transaction(bfm):
     return txn
 
 
+async def read_fifo_transactions(bfm, count):
+    """
+    Read up to `count` transactions from the monitor FIFO.
+
+    Stops early if the FIFO runs empty, so the caller can check the length
+    of the result and compare the captured fields against the expected
+    stream in a single assertion.
+
+    Returns:
+        List of transaction dicts as returned by read_fifo_transaction().
+    """
+    txns = []
+    for _ in range(count):
+        txn = await read_fifo_transaction(bfm)
+        if txn is None:
+            break
+        txns.append(txn)
+    return txns
+
+
+def format_addr_data(pairs):
+    """Format (address, data) pairs for assertion messages."""
+    return ", ".join(f"0x{addr:08X}=0x{data:08X}" for addr, data in pairs)
+
+
 # =============================================================================
 # Transaction Monitor Tests
 # =============================================================================
@@ -178,18 +274,14 @@ async def test_monitor_enable_capture(dut):
 
     Verifies that transactions are only captured when TXN_CTRL[0]=1.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, SYS_CLK_PERIOD_NS, unit="ns").start())
 
     bfm = PCIeBFM(dut)
     await reset_dut(dut)
 
     dut._log.info("Testing monitor enable/disable")
 
-    # Enable capture first, then clear FIFO to remove the enable transaction itself
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)  # Enable capture
-    await ClockCycles(bfm.clk, 5)
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # Clear FIFO (keep enabled)
-    await ClockCycles(bfm.clk, 5)
+    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # {CLEAR, ENABLE}
 
     # Inject a test write to BAR1 (this should be captured)
     test_write = TLPBuilder.memory_write_32(
@@ -226,16 +318,12 @@ async def test_monitor_captures_write(dut):
     """
     Verify monitor captures inbound Memory Write TLPs correctly.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, SYS_CLK_PERIOD_NS, unit="ns").start())
 
     bfm = PCIeBFM(dut)
     await reset_dut(dut)
 
-    # Enable capture first, then clear FIFO to remove the enable transaction itself
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)  # Enable capture
-    await ClockCycles(bfm.clk, 5)
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # Clear FIFO (keep enabled)
-    await ClockCycles(bfm.clk, 5)
+    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # {CLEAR, ENABLE}
 
     # Inject a write with specific data
     test_addr = 0x200
@@ -271,16 +359,12 @@ async def test_monitor_captures_read(dut):
     """
     Verify monitor captures inbound Memory Read TLPs correctly.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, SYS_CLK_PERIOD_NS, unit="ns").start())
 
     bfm = PCIeBFM(dut)
     await reset_dut(dut)
 
-    # Enable capture first, then clear FIFO to remove the enable transaction itself
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)  # Enable capture
-    await ClockCycles(bfm.clk, 5)
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # Clear FIFO (keep enabled)
-    await ClockCycles(bfm.clk, 5)
+    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # {CLEAR, ENABLE}
 
     # Inject a read request
     test_addr = 0x300
@@ -319,14 +403,13 @@ async def test_monitor_extracts_attributes(dut):
     """
     Verify monitor captures transactions even when attr/AT are non-zero.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, SYS_CLK_PERIOD_NS, unit="ns").start())
 
     bfm = PCIeBFM(dut)
     await reset_dut(dut)
 
     # Enable the monitor (and clear the FIFO)
     await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # {CLEAR, ENABLE}
-    await ClockCycles(bfm.clk, 5)
 
     # Test 1: Inject write with No Snoop (attr=0b01) and Translated address (at=0b10)
     test_attr = 0b01  # No Snoop
@@ -356,7 +439,6 @@ async def test_monitor_extracts_attributes(dut):
 
     # Test 2: Clear and test with Relaxed Ordering (attr=0b10) and Translation Request (at=0b01)
     await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # Clear FIFO (keep enabled)
-    await ClockCycles(bfm.clk, 5)
 
     test_attr2 = 0b10  # Relaxed Ordering
     test_at2 = 0b01    # Translation Request
@@ -391,7 +473,7 @@ async def test_monitor_captures_bar_hits(dut):
     """
     Verify monitor captures writes to different BAR windows.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, SYS_CLK_PERIOD_NS, unit="ns").start())
 
     bfm = PCIeBFM(dut)
     await reset_dut(dut)
@@ -404,11 +486,7 @@ async def test_monitor_captures_bar_hits(dut):
     ]
 
     for tc in test_cases:
-        # Enable capture and clear FIFO
-        await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)
-        await ClockCycles(bfm.clk, 5)
-        await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)
-        await ClockCycles(bfm.clk, 5)
+        await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # {CLEAR, ENABLE}
 
         # Inject write to specific BAR
         test_write = TLPBuilder.memory_write_32(
@@ -442,16 +520,12 @@ async def test_monitor_fifo_clear(dut):
     """
     Verify FIFO can be cleared via TXN_CTRL[1].
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, SYS_CLK_PERIOD_NS, unit="ns").start())
 
     bfm = PCIeBFM(dut)
     await reset_dut(dut)
 
-    # Enable capture first, then clear FIFO to remove the enable transaction itself
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)  # Enable capture
-    await ClockCycles(bfm.clk, 5)
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # Clear FIFO (keep enabled)
-    await ClockCycles(bfm.clk, 5)
+    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # {CLEAR, ENABLE}
 
     # Inject a few transactions with distinct data
     test_data = [0xAABBCCDD, 0x11223344, 0x55667788]
@@ -498,7 +572,7 @@ async def test_monitor_captures_first_be_partial(dut):
     Tests various first_be patterns to validate byte-size encoding.
     This is required for BSA ACS e022 compliance verification.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, SYS_CLK_PERIOD_NS, unit="ns").start())
 
     bfm = PCIeBFM(dut)
     await reset_dut(dut)
@@ -515,11 +589,7 @@ async def test_monitor_captures_first_be_partial(dut):
     for first_be, expected_bytes, desc in test_cases:
         dut._log.info(f"--- Testing first_be=0x{first_be:X} ({desc}) ---")
 
-        # Enable and clear FIFO
-        await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)
-        await ClockCycles(bfm.clk, 5)
-        await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)
-        await ClockCycles(bfm.clk, 5)
+        await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # {CLEAR, ENABLE}
 
         # Inject write with specific first_be
         test_write = TLPBuilder.memory_write_32(
@@ -552,7 +622,7 @@ async def test_monitor_captures_multi_dword_be(dut):
 
     For multi-DWORD TLPs, size should reflect enabled bytes in the beat.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, SYS_CLK_PERIOD_NS, unit="ns").start())
 
     bfm = PCIeBFM(dut)
     await reset_dut(dut)
@@ -567,11 +637,7 @@ async def test_monitor_captures_multi_dword_be(dut):
     for first_be, last_be, expected_bytes, desc in test_cases:
         dut._log.info(f"--- Testing {desc}: first_be=0x{first_be:X}, last_be=0x{last_be:X} ---")
 
-        # Enable and clear FIFO
-        await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)
-        await ClockCycles(bfm.clk, 5)
-        await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)
-        await ClockCycles(bfm.clk, 5)
+        await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # {CLEAR, ENABLE}
 
         # Inject multi-DWORD write
         data_bytes = bytes([0x11, 0x22, 0x33, 0x44, 0x55, 0x66, 0x77, 0x88])
@@ -608,7 +674,7 @@ async def test_monitor_captures_read_first_be(dut):
 
     Memory reads use first_be to indicate which bytes are requested.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, SYS_CLK_PERIOD_NS, unit="ns").start())
 
     bfm = PCIeBFM(dut)
     await reset_dut(dut)
@@ -624,11 +690,7 @@ async def test_monitor_captures_read_first_be(dut):
     for first_be, expected_bytes, desc in test_cases:
         dut._log.info(f"--- Testing read first_be=0x{first_be:X} ({desc}) ---")
 
-        # Enable and clear FIFO
-        await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)
-        await ClockCycles(bfm.clk, 5)
-        await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)
-        await ClockCycles(bfm.clk, 5)
+        await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # {CLEAR, ENABLE}
 
         # Inject read with specific first_be
         test_read = TLPBuilder.memory_read_32(
@@ -669,16 +731,12 @@ async def test_monitor_be_zero_handling(dut):
     Per PCIe spec, first_be=0 is valid for zero-length reads.
     This tests edge case handling.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, SYS_CLK_PERIOD_NS, unit="ns").start())
 
     bfm = PCIeBFM(dut)
     await reset_dut(dut)
 
-    # Enable and clear FIFO
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)
-    await ClockCycles(bfm.clk, 5)
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)
-    await ClockCycles(bfm.clk, 5)
+    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # {CLEAR, ENABLE}
 
     # Inject write with first_be=0 (unusual but valid)
     test_write = TLPBuilder.memory_write_32(
@@ -711,9 +769,32 @@ async def test_monitor_be_zero_handling(dut):
 
 # FIFO depth is 32 transactions (BSA spec maximum) per bsa_pcie_exerciser.py
 # Note: BAR0 register accesses (TXN_CTRL reads/writes) are also captured!
+FIFO_DEPTH = 32
+
+# The overflow and count-tracking checks run as phases of a single test so
+# they share one clock start and reset. Each phase starts by clearing and
+# enabling the monitor, so no extra reset is needed between phases.
+
 
-@cocotb.test(timeout_time=500, timeout_unit="us")
-async def test_monitor_fifo_overflow_stops_capture(dut):
+async def set_txn_ctrl(bfm, value, settle_cycles=5):
+    """
+    Set TXN_CTRL as test setup rather than as the thing under test.
+
+    BSARegisters.txn_ctrl has no stable hierarchical name in the flattened
+    Migen netlist, so there is no backdoor to poke; this goes through the
+    front-door posted write. Keeping the setup writes behind one helper
+    leaves a single place to swap in a backdoor later.
+
+    Args:
+        bfm: PCIeBFM instance
+        value: TXN_CTRL value ([0]=enable, [1]=clear)
+        settle_cycles: Extra cycles to wait after the write lands
+    """
+    await write_bar0_register(bfm, REG_TXN_CTRL, value)
+    await ClockCycles(bfm.clk, settle_cycles)
+
+
+async def phase_fifo_overflow_stops_capture(dut, bfm):
     """
     Verify FIFO stops accepting transactions when full and sets overflow flag.
 
@@ -724,34 +805,24 @@ async def test_monitor_fifo_overflow_stops_capture(dut):
     Note: The monitor captures ALL transactions including BAR0 register accesses,
     so we account for this in our calculations.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
-
-    bfm = PCIeBFM(dut)
-    await reset_dut(dut)
-
-    FIFO_DEPTH = 32  # Actual depth from bsa_pcie_exerciser.py
     OVERFLOW_COUNT = 5
 
     dut._log.info(f"Testing FIFO overflow: injecting {FIFO_DEPTH + OVERFLOW_COUNT} transactions to BAR1")
 
-    # Enable capture and clear
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)
-    await ClockCycles(bfm.clk, 5)
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)
-    await ClockCycles(bfm.clk, 5)
+    await set_txn_ctrl(bfm, 0x03)  # {CLEAR, ENABLE}
 
     # Inject transactions with distinct data patterns (to BAR1)
     # These are pure writes, no reads needed, so only these get captured
-    for i in range(FIFO_DEPTH + OVERFLOW_COUNT):
-        data_pattern = 0x10000000 | (i << 16) | i
-        test_write = TLPBuilder.memory_write_32(
-            address=0x100 + (i * 4),
-            data_bytes=data_pattern.to_bytes(4, 'little'),
-            requester_id=0x0100,
-            tag=i,
-        )
-        await bfm.inject_tlp(test_write, bar_hit=0b000010)  # BAR1
-        await ClockCycles(bfm.clk, 5)
+    # (address, data) pairs are computed up front so the awaiting loop only patches
+    writes = [(0x100 + (i * 4), 0x10000000 | (i << 16) | i)
+              for i in range(FIFO_DEPTH + OVERFLOW_COUNT)]
+    test_write = TLPBuilder.make_memory_write_32_template(requester_id=0x0100)
+    # Bind the per-iteration callables once; this loop runs FIFO_DEPTH+ times
+    patch, inject, clk = TLPBuilder.patch_memory_write_32, bfm.inject_tlp, bfm.clk
+    for i, (address, data_pattern) in enumerate(writes):
+        patch(test_write, address, data_pattern, i)
+        await inject(test_write, bar_hit=0b000010)  # BAR1
+        await ClockCycles(clk, 5)
 
     dut._log.info("All transactions injected, checking status")
 
@@ -768,20 +839,15 @@ async def test_monitor_fifo_overflow_stops_capture(dut):
         f"Count should be {FIFO_DEPTH}, got {status['count']}"
 
     # Read all captured transactions
-    captured_count = 0
-    first_txn = None
-
-    for i in range(FIFO_DEPTH + 10):  # Try to read more than we expect
-        txn = await read_fifo_transaction(bfm)
-        if txn is None:
-            break
-        captured_count += 1
-        if first_txn is None:
-            first_txn = txn
-        if i < 5:  # Log first few
-            dut._log.info(f"Transaction {i}: addr=0x{txn['address']:08X}, data=0x{txn['data_lo']:08X}")
+    txns = await read_fifo_transactions(bfm, FIFO_DEPTH + 10)  # Try to read more than we expect
+    captured_count = len(txns)
+    first_txn = txns[0] if txns else None
 
     dut._log.info(f"Captured {captured_count} transactions from FIFO")
+    if dut._log.isEnabledFor(logging.INFO):
+        # Summarise the first few once, rather than formatting inside the drain
+        first_few = [(txn['address'], txn['data_lo']) for txn in txns[:5]]
+        dut._log.info(f"First transactions: {format_addr_data(first_few)}")
 
     # Verify we captured exactly FIFO_DEPTH transactions
     assert captured_count == FIFO_DEPTH, \
@@ -789,8 +855,7 @@ async def test_monitor_fifo_overflow_stops_capture(dut):
 
     # Verify first transaction has expected data (wasn't overwritten)
     if first_txn is not None:
-        expected_addr = 0x100
-        expected_data = 0x10000000
+        expected_addr, expected_data = writes[0]
         assert first_txn['address'] == expected_addr, \
             f"First transaction address corrupted: got 0x{first_txn['address']:08X}"
         assert first_txn['data_lo'] == expected_data, \
@@ -801,11 +866,10 @@ async def test_monitor_fifo_overflow_stops_capture(dut):
     assert status['overflow'] == 1, "Overflow flag should remain set (sticky)"
 
     dut._log.info("PASS: FIFO correctly stopped at capacity, overflow flag set")
-    dut._log.info("test_monitor_fifo_overflow_stops_capture PASSED")
+    dut._log.info("phase_fifo_overflow_stops_capture PASSED")
 
 
-@cocotb.test(timeout_time=500, timeout_unit="us")
-async def test_monitor_fifo_overflow_recovery(dut):
+async def phase_fifo_overflow_recovery(dut, bfm):
     """
     Verify FIFO and overflow flag are cleared together, allowing recovery.
 
@@ -814,38 +878,24 @@ async def test_monitor_fifo_overflow_recovery(dut):
     2. Clear the sticky overflow flag
     3. Allow new transactions to be captured
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
-
-    bfm = PCIeBFM(dut)
-    await reset_dut(dut)
-
-    FIFO_DEPTH = 32  # Actual depth from bsa_pcie_exerciser.py
-
     dut._log.info("Filling FIFO to capacity and causing overflow")
 
-    # Enable capture and clear
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)
-    await ClockCycles(bfm.clk, 5)
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)
-    await ClockCycles(bfm.clk, 5)
+    await set_txn_ctrl(bfm, 0x03)  # {CLEAR, ENABLE}
 
     # Fill FIFO completely + overflow
+    test_write = TLPBuilder.make_memory_write_32_template(requester_id=0x0100)
+    patch, inject, clk = TLPBuilder.patch_memory_write_32, bfm.inject_tlp, bfm.clk
     for i in range(FIFO_DEPTH + 5):
-        test_write = TLPBuilder.memory_write_32(
-            address=0x200 + (i * 4),
-            data_bytes=b'\xAA\xBB\xCC\xDD',
-            requester_id=0x0100,
-            tag=i & 0xFF,
-        )
-        await bfm.inject_tlp(test_write, bar_hit=0b000010)
-        await ClockCycles(bfm.clk, 3)
+        # 0xDDCCBBAA is the register view of bytes AA BB CC DD
+        patch(test_write, 0x200 + (i * 4), 0xDDCCBBAA, i)
+        await inject(test_write, bar_hit=0b000010)
+        await ClockCycles(clk, 3)
 
     # Disable capture before reading status (so reads aren't captured)
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x00)
-    await ClockCycles(bfm.clk, 5)
+    await set_txn_ctrl(bfm, 0x00)
 
     # Verify overflow is set
-    status = await read_txn_ctrl_status(bfm, tag=0xB0)
+    status = peek_txn_ctrl_status(dut)
     dut._log.info(f"Before clear: overflow={status['overflow']}, count={status['count']}")
     assert status['overflow'] == 1, "Overflow should be set after exceeding capacity"
     assert status['count'] == FIFO_DEPTH, f"Count should be {FIFO_DEPTH}"
@@ -853,62 +903,48 @@ async def test_monitor_fifo_overflow_recovery(dut):
     dut._log.info("Clearing FIFO and overflow flag")
 
     # Clear FIFO (this should also clear overflow), keep disabled
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x02)  # Clear only, stay disabled
-    await ClockCycles(bfm.clk, 10)
+    await set_txn_ctrl(bfm, 0x02, settle_cycles=10)  # Clear only, stay disabled
 
     # Verify FIFO is empty and overflow is cleared
-    status = await read_txn_ctrl_status(bfm, tag=0xB1)
+    status = peek_txn_ctrl_status(dut)
     dut._log.info(f"After clear: overflow={status['overflow']}, count={status['count']}")
     assert status['overflow'] == 0, "Overflow should be cleared after clear"
     assert status['count'] == 0, "Count should be 0 after clear"
 
     # Re-enable capture for new transactions
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)  # Enable
-    await ClockCycles(bfm.clk, 5)
+    await set_txn_ctrl(bfm, 0x01)  # Enable
 
     dut._log.info("Injecting new transactions after recovery")
 
     # Inject new transactions
-    for i in range(5):
-        data_pattern = 0x55000000 | i
-        test_write = TLPBuilder.memory_write_32(
-            address=0x300 + (i * 4),
-            data_bytes=data_pattern.to_bytes(4, 'little'),
-            requester_id=0x0100,
-            tag=0x80 + i,
-        )
+    new_writes = [(0x300 + (i * 4), 0x55000000 | i) for i in range(5)]
+    for i, (address, data_pattern) in enumerate(new_writes):
+        TLPBuilder.patch_memory_write_32(test_write, address, data_pattern, 0x80 + i)
         await bfm.inject_tlp(test_write, bar_hit=0b000010)
         await ClockCycles(bfm.clk, 5)
 
     # Disable capture before verifying
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x00)
-    await ClockCycles(bfm.clk, 5)
+    await set_txn_ctrl(bfm, 0x00)
 
     # Verify count reflects new transactions
     # TXN_CTRL writes are excluded from capture, so only BAR1 writes are counted
-    status = await read_txn_ctrl_status(bfm, tag=0xB2)
+    status = peek_txn_ctrl_status(dut)
     dut._log.info(f"After new txns: overflow={status['overflow']}, count={status['count']}")
     assert status['count'] == 5, f"Count should be 5 (BAR1 writes only), got {status['count']}"
     assert status['overflow'] == 0, "Overflow should still be 0"
 
     # Verify all 5 BAR1 transactions were captured
-    for i in range(5):
-        txn = await read_fifo_transaction(bfm)
-        assert txn is not None, f"Expected transaction {i}"
-        expected_addr = 0x300 + (i * 4)
-        expected_data = 0x55000000 | i
-        assert txn['address'] == expected_addr, \
-            f"Expected address 0x{expected_addr:08X}, got 0x{txn['address']:08X}"
-        assert txn['data_lo'] == expected_data, \
-            f"Expected data 0x{expected_data:08X}, got 0x{txn['data_lo']:08X}"
+    txns = await read_fifo_transactions(bfm, len(new_writes))
+    captured = [(txn['address'], txn['data_lo']) for txn in txns]
+    assert captured == new_writes, \
+        f"Expected [{format_addr_data(new_writes)}], got [{format_addr_data(captured)}]"
     dut._log.info("All 5 BAR1 transactions captured correctly")
 
     dut._log.info("PASS: FIFO and overflow recovered after clear")
-    dut._log.info("test_monitor_fifo_overflow_recovery PASSED")
+    dut._log.info("phase_fifo_overflow_recovery PASSED")
 
 
-@cocotb.test(timeout_time=500, timeout_unit="us")
-async def test_monitor_fifo_overflow_lockout(dut):
+async def phase_fifo_overflow_lockout(dut, bfm):
     """
     Verify that overflow lockout prevents new captures until clear.
 
@@ -916,33 +952,19 @@ async def test_monitor_fifo_overflow_lockout(dut):
     there is space in the FIFO (after reads). The lockout persists until
     the clear bit is written.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
-
-    bfm = PCIeBFM(dut)
-    await reset_dut(dut)
-
-    FIFO_DEPTH = 32  # Actual depth from bsa_pcie_exerciser.py
-
     dut._log.info("Testing overflow lockout behavior")
 
-    # Enable capture and clear
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)
-    await ClockCycles(bfm.clk, 5)
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)
-    await ClockCycles(bfm.clk, 5)
+    await set_txn_ctrl(bfm, 0x03)  # {CLEAR, ENABLE}
 
     # Fill FIFO and cause overflow
     dut._log.info(f"Filling FIFO with {FIFO_DEPTH + 2} transactions (overflow by 2)")
-    for i in range(FIFO_DEPTH + 2):
-        data_pattern = 0x11110000 | i
-        test_write = TLPBuilder.memory_write_32(
-            address=0x400 + (i * 4),
-            data_bytes=data_pattern.to_bytes(4, 'little'),
-            requester_id=0x0100,
-            tag=i & 0xFF,
-        )
-        await bfm.inject_tlp(test_write, bar_hit=0b000010)
-        await ClockCycles(bfm.clk, 3)
+    test_write = TLPBuilder.make_memory_write_32_template(requester_id=0x0100)
+    fill_writes = [(0x400 + (i * 4), 0x11110000 | i) for i in range(FIFO_DEPTH + 2)]
+    patch, inject, clk = TLPBuilder.patch_memory_write_32, bfm.inject_tlp, bfm.clk
+    for i, (address, data_pattern) in enumerate(fill_writes):
+        patch(test_write, address, data_pattern, i)
+        await inject(test_write, bar_hit=0b000010)
+        await ClockCycles(clk, 3)
 
     # Verify overflow is set (overflow lockout prevents new captures even with enable=1)
     status = await read_txn_ctrl_status(bfm, tag=0xC0)
@@ -952,9 +974,10 @@ async def test_monitor_fifo_overflow_lockout(dut):
 
     # Read out half the transactions (creates space, but lockout should prevent new captures)
     dut._log.info("Reading 16 transactions to create space")
-    for i in range(16):
-        txn = await read_fifo_transaction(bfm)
-        assert txn is not None, f"Expected transaction {i}"
+    txns = await read_fifo_transactions(bfm, 16)
+    captured = [(txn['address'], txn['data_lo']) for txn in txns]
+    assert captured == fill_writes[:16], \
+        f"Expected [{format_addr_data(fill_writes[:16])}], got [{format_addr_data(captured)}]"
 
     # Verify count decreased but overflow still set
     # Note: reads while in overflow lockout shouldn't be captured
@@ -963,18 +986,13 @@ async def test_monitor_fifo_overflow_lockout(dut):
     assert status['overflow'] == 1, "Overflow should still be set (sticky)"
     assert status['count'] == 16, f"Count should be 16 after reading 16, got {status['count']}"
 
-    # Try to inject more transactions (should be dropped due to lockout)
-    dut._log.info("Injecting transactions while locked out (should be dropped)")
-    for i in range(4):
-        data_pattern = 0x22220000 | i
-        test_write = TLPBuilder.memory_write_32(
-            address=0x500 + (i * 4),
-            data_bytes=data_pattern.to_bytes(4, 'little'),
-            requester_id=0x0100,
-            tag=0x80 + i,
-        )
-        await bfm.inject_tlp(test_write, bar_hit=0b000010)
-        await ClockCycles(bfm.clk, 5)
+    # Inject one more transaction (should be dropped due to lockout). With
+    # free space in the FIFO, a single dropped write is enough to show the
+    # lockout is active.
+    dut._log.info("Injecting a transaction while locked out (should be dropped)")
+    TLPBuilder.patch_memory_write_32(test_write, 0x500, 0x22220000, 0x80)
+    await bfm.inject_tlp(test_write, bar_hit=0b000010)
+    await ClockCycles(bfm.clk, 5)
 
     # Verify count is unchanged (lockout prevented captures)
     status = await read_txn_ctrl_status(bfm, tag=0xC2)
@@ -983,106 +1001,118 @@ async def test_monitor_fifo_overflow_lockout(dut):
 
     # Clear and disable before checking state
     dut._log.info("Clearing overflow and verifying normal operation")
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x02)  # Clear only, stay disabled
-    await ClockCycles(bfm.clk, 10)
+    await set_txn_ctrl(bfm, 0x02, settle_cycles=10)  # Clear only, stay disabled
 
-    status = await read_txn_ctrl_status(bfm, tag=0xC3)
+    status = peek_txn_ctrl_status(dut)
     assert status['overflow'] == 0, "Overflow should be cleared"
     assert status['count'] == 0, "Count should be 0 after clear"
     dut._log.info(f"After clear: overflow={status['overflow']}, count={status['count']}")
 
     # Re-enable for new captures
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x01)  # Enable
-    await ClockCycles(bfm.clk, 5)
+    await set_txn_ctrl(bfm, 0x01)  # Enable
 
     # Inject new transactions (should be captured now)
     dut._log.info("Injecting transactions after clear (should be captured)")
-    for i in range(4):
-        data_pattern = 0x33330000 | i
-        test_write = TLPBuilder.memory_write_32(
-            address=0x600 + (i * 4),
-            data_bytes=data_pattern.to_bytes(4, 'little'),
-            requester_id=0x0100,
-            tag=0x90 + i,
-        )
+    new_writes = [(0x600 + (i * 4), 0x33330000 | i) for i in range(4)]
+    for i, (address, data_pattern) in enumerate(new_writes):
+        TLPBuilder.patch_memory_write_32(test_write, address, data_pattern, 0x90 + i)
         await bfm.inject_tlp(test_write, bar_hit=0b000010)
         await ClockCycles(bfm.clk, 5)
 
     # Disable before checking (TXN_CTRL writes are NOT captured)
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x00)
-    await ClockCycles(bfm.clk, 5)
+    await set_txn_ctrl(bfm, 0x00)
 
-    status = await read_txn_ctrl_status(bfm, tag=0xC4)
+    status = peek_txn_ctrl_status(dut)
     dut._log.info(f"After post-clear inject: overflow={status['overflow']}, count={status['count']}")
     # TXN_CTRL writes are excluded from capture, so only BAR1 writes are counted
     assert status['count'] == 4, f"Count should be 4 (BAR1 writes only), got {status['count']}"
 
     dut._log.info("PASS: Overflow lockout correctly prevented captures until clear")
-    dut._log.info("test_monitor_fifo_overflow_lockout PASSED")
+    dut._log.info("phase_fifo_overflow_lockout PASSED")
 
 
-@cocotb.test(timeout_time=200, timeout_unit="us")
-async def test_monitor_count_tracking(dut):
+async def phase_count_tracking(dut, bfm):
     """
     Verify count field accurately tracks transactions as they're added and read.
 
     Key insight: Disable capture before reading TXN_CTRL/TXN_TRACE so those
     reads don't pollute the count.
     """
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
-
-    bfm = PCIeBFM(dut)
-    await reset_dut(dut)
-
     dut._log.info("Testing count field tracking")
 
     # Enable capture and clear
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x03)  # Clear + enable
-    await ClockCycles(bfm.clk, 5)
+    await set_txn_ctrl(bfm, 0x03)  # Clear + enable
 
     # Inject 5 transactions
     dut._log.info("Injecting 5 transactions to BAR1")
-    for i in range(5):
-        test_write = TLPBuilder.memory_write_32(
-            address=0x100 + (i * 4),
-            data_bytes=(0x11110000 | i).to_bytes(4, 'little'),
-            requester_id=0x0100,
-            tag=i,
-        )
+    test_write = TLPBuilder.make_memory_write_32_template(requester_id=0x0100)
+    writes = [(0x100 + (i * 4), 0x11110000 | i) for i in range(5)]
+    for i, (address, data_pattern) in enumerate(writes):
+        TLPBuilder.patch_memory_write_32(test_write, address, data_pattern, i)
         await bfm.inject_tlp(test_write, bar_hit=0b000010)
         await ClockCycles(bfm.clk, 5)
 
     # Disable capture before checking count
     # Note: TXN_CTRL writes go directly to registers, not through PCIe depacketizer,
     # so they are NOT captured by the monitor
-    await write_bar0_register(bfm, REG_TXN_CTRL, 0x00)  # Disable
-    await ClockCycles(bfm.clk, 5)
+    await set_txn_ctrl(bfm, 0x00)  # Disable
 
     # Now check count - should be exactly 5 (only BAR1 writes captured)
-    status = await read_txn_ctrl_status(bfm, tag=0xD0)
+    status = peek_txn_ctrl_status(dut)
     dut._log.info(f"After injecting 5 writes: count={status['count']}")
     assert status['count'] == 5, f"Count should be 5, got {status['count']}"
 
     # Read 3 transactions from FIFO (capture still disabled)
     dut._log.info("Reading 3 transactions from FIFO")
-    for i in range(3):
-        txn = await read_fifo_transaction(bfm)
-        assert txn is not None, f"Expected transaction {i}"
+    txns = await read_fifo_transactions(bfm, 3)
+    captured = [(txn['address'], txn['data_lo']) for txn in txns]
+    assert captured == writes[:3], \
+        f"Expected [{format_addr_data(writes[:3])}], got [{format_addr_data(captured)}]"
 
     # Check count decreased to 2 (was 5, read 3)
-    status = await read_txn_ctrl_status(bfm, tag=0xE0)
+    status = peek_txn_ctrl_status(dut)
     dut._log.info(f"After reading 3 transactions: count={status['count']}")
     assert status['count'] == 2, f"Count should be 2, got {status['count']}"
 
     # Read remaining 2 transactions
-    for i in range(2):
-        txn = await read_fifo_transaction(bfm)
-        assert txn is not None, f"Expected transaction {i}"
+    txns = await read_fifo_transactions(bfm, 2)
+    captured = [(txn['address'], txn['data_lo']) for txn in txns]
+    assert captured == writes[3:], \
+        f"Expected [{format_addr_data(writes[3:])}], got [{format_addr_data(captured)}]"
 
     # Verify count is 0
-    status = await read_txn_ctrl_status(bfm, tag=0xE1)
+    status = peek_txn_ctrl_status(dut)
     dut._log.info(f"After reading all: count={status['count']}")
     assert status['count'] == 0, f"Count should be 0, got {status['count']}"
 
     dut._log.info("PASS: Count field correctly tracks transaction flow")
-    dut._log.info("test_monitor_count_tracking PASSED")
+    dut._log.info("phase_count_tracking PASSED")
+
+
+@cocotb.test(timeout_time=1700, timeout_unit="us")
+async def test_monitor_fifo_overflow(dut):
+    """
+    Run the FIFO overflow and count-tracking phases in one simulation.
+
+    Phases:
+    1. Overflow stops capture and sets the sticky flag
+    2. Clear recovers from overflow
+    3. Overflow locks out capture until clear, even with free space
+    4. Count tracks transactions as they are added and read
+    """
+    cocotb.start_soon(Clock(dut.sys_clk, SYS_CLK_PERIOD_NS, unit="ns").start())
+
+    bfm = PCIeBFM(dut)
+    await reset_dut(dut)
+
+    phases = (
+        phase_fifo_overflow_stops_capture,
+        phase_fifo_overflow_recovery,
+        phase_fifo_overflow_lockout,
+        phase_count_tracking,
+    )
+    for n, phase in enumerate(phases, start=1):
+        dut._log.info(f"=== phase {n}: {phase.__name__} ===")
+        await phase(dut, bfm)
+
+    dut._log.info("test_monitor_fifo_overflow PASSED")
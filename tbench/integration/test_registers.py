@@ -76,14 +76,28 @@ async def read_bar0_register(bfm, offset, tag=0):
     Returns:
         32-bit register value, or None on timeout
     """
-    # Build Memory Read TLP
+    # Build Memory Read TLP (memoized - register reads repeat the same offset/tag)
     # Note: Use BAR-relative address (offset only) since depacketizer applies mask
-    beats = TLPBuilder.memory_read_32(
+    beats = TLPBuilder.memory_read_32_cached(
         address=offset,  # BAR-relative offset
         length_dw=1,
         requester_id=0x0100,
         tag=tag,
     )
+    return await inject_and_capture(bfm, beats)
+
+
+async def inject_and_capture(bfm, beats):
+    """
+    Inject a prebuilt BAR0 Memory Read TLP and return the completion data.
+
+    Args:
+        bfm: PCIeBFM instance
+        beats: Memory Read TLP beats (e.g. from TLPBuilder.memory_read_32)
+
+    Returns:
+        32-bit register value, or None on timeout
+    """
     await bfm.inject_tlp(beats, bar_hit=0b000001)  # BAR0
 
     # Wait for completion
@@ -275,8 +289,14 @@ async def test_bar0_multiple_sequential_reads(dut):
         (0x20, "PASID_VAL"),
     ]
 
-    for i, (offset, name) in enumerate(registers):
-        data = await read_bar0_register(bfm, offset=offset, tag=i+10)
+    # Build the read TLPs once, up front
+    read_beats = [
+        TLPBuilder.memory_read_32(address=offset, length_dw=1, requester_id=0x0100, tag=i+10)
+        for i, (offset, _) in enumerate(registers)
+    ]
+
+    for (offset, name), beats in zip(registers, read_beats):
+        data = await inject_and_capture(bfm, beats)
         if data is None:
             raise AssertionError(f"Timeout reading {name} register")
         dut._log.info(f"{name} (offset 0x{offset:02X}) = 0x{data:08X}")
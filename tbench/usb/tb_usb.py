@@ -168,6 +168,19 @@ class USBTestbench(LiteXModule):
         self.usb_rx_fifo_level = Signal(8, name="usb_rx_fifo_level")
         self.usb_tx_fifo_level = Signal(8, name="usb_tx_fifo_level")
 
+        # Observation-only copies of ATS status so tests can wait on them
+        # instead of polling ATSCTL over Etherbone
+        self.ats_success     = Signal(name="ats_success")
+        self.atc_invalidated = Signal(name="atc_invalidated")
+
+        # Observation-only copies of USB monitor control and statistics
+        self.usb_mon_rx_enable   = Signal(name="usb_mon_rx_enable")
+        self.usb_mon_tx_enable   = Signal(name="usb_mon_tx_enable")
+        self.usb_mon_rx_captured = Signal(32, name="usb_mon_rx_captured")
+
+        # Observation-only copy of the DMA engine's busy flag
+        self.dma_busy = Signal(name="dma_busy")
+
         # Wire external signals to USB stub
         self.comb += [
             # Host -> Device
@@ -186,6 +199,18 @@ class USBTestbench(LiteXModule):
             # Status
             self.usb_rx_fifo_level.eq(self.usb_phy.rx_fifo_level),
             self.usb_tx_fifo_level.eq(self.usb_phy.tx_fifo_level),
+
+            # ATS status -> testbench
+            self.ats_success.eq(self.soc.ats_engine.success),
+            self.atc_invalidated.eq(self.soc.atc.invalidated),
+
+            # USB monitor control/statistics -> testbench
+            self.usb_mon_rx_enable.eq(self.soc.usb_monitor.rx_enable),
+            self.usb_mon_tx_enable.eq(self.soc.usb_monitor.tx_enable),
+            self.usb_mon_rx_captured.eq(self.soc.usb_monitor.rx_captured),
+
+            # DMA engine status -> testbench
+            self.dma_busy.eq(self.soc.dma_engine.busy),
         ]
 
 
@@ -231,6 +256,16 @@ def generate_verilog():
         # USB control/status
         testbench.usb_tx_backpressure,
         testbench.usb_rx_fifo_level, testbench.usb_tx_fifo_level,
+
+        # ATS status
+        testbench.ats_success, testbench.atc_invalidated,
+
+        # USB monitor control/statistics
+        testbench.usb_mon_rx_enable, testbench.usb_mon_tx_enable,
+        testbench.usb_mon_rx_captured,
+
+        # DMA engine status
+        testbench.dma_busy,
     }
 
     output = convert(testbench, ios=ios, name="tb_usb")
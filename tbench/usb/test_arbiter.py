@@ -9,19 +9,14 @@
 
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import ClockCycles
-
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from cocotb.triggers import ClockCycles, Combine
 
 from tbench.common.usb_bfm import USBBFM
 from tbench.common.pcie_bfm import PCIeBFM
 from tbench.common.tlp_builder import TLPBuilder
 
 from bsa_pcie_exerciser.common.protocol import (
-    parse_tlp_packet, TLPPacket, Direction,
+    parse_tlp_packet, parse_tlp_packet_batch, TLPPacket, Direction,
 )
 
 
@@ -38,6 +33,19 @@ REG_USB_MON_CTRL = 0x080
 REG_USB_MON_RX_CAPTURED = 0x088
 REG_USB_MON_TX_CAPTURED = 0x090
 
+# Incrementing 4-DWORD write payload
+_WRITE_DATA_16 = bytes(range(16))
+
+# test_arbiter_under_load: TLPs injected and minimum captured (80%)
+NUM_TLPS = 10
+_MIN_CAPTURED = NUM_TLPS * 8 // 10
+
+# Idle sys_clk cycles between ID-register reads in the RX+TX tests. The
+# monitor header FIFOs are only 4 deep and drop whole packets when full
+# (the PHY's rx_ready does not see them), so the gap must let the USB side
+# drain each MRd and its completion: about 35 cycles for these packets.
+_MRD_CPL_GAP = 35
+
 
 # =============================================================================
 # Test Utilities
@@ -78,6 +86,45 @@ def parse_monitor_packet(data: bytes) -> TLPPacket:
     return pkt
 
 
+def parse_monitor_packets(captured: list[bytes]) -> list[TLPPacket]:
+    """Parse a batch of USB monitor packets into TLPPackets."""
+    pkts = parse_tlp_packet_batch(captured)
+    if len(pkts) != len(captured):
+        raise ValueError(f"Failed to parse {len(captured) - len(pkts)} monitor packet(s)")
+    return pkts
+
+
+async def capture_rx_tx(usb_bfm: USBBFM, min_rx: int, min_tx: int,
+                        max_packets: int, idle_cycles: int = 200):
+    """
+    Capture monitor packets until both RX and TX minimums are met.
+
+    Each round only asks for as many packets as are still missing, so
+    capture stops as soon as both targets are reached rather than
+    draining up to max_packets.
+
+    Returns:
+        (rx_packets, tx_packets) lists of TLPPacket
+    """
+    rx_packets = []
+    tx_packets = []
+
+    while True:
+        needed = max(min_rx - len(rx_packets), 0) + max(min_tx - len(tx_packets), 0)
+        needed = min(needed, max_packets - len(rx_packets) - len(tx_packets))
+        if needed <= 0:
+            break
+
+        captured = await usb_bfm.capture_n(needed, idle_cycles=idle_cycles)
+        for pkt in parse_monitor_packets(captured):
+            (rx_packets if pkt.direction == Direction.RX else tx_packets).append(pkt)
+
+        if len(captured) < needed:
+            break  # Stream went idle
+
+    return rx_packets, tx_packets
+
+
 # =============================================================================
 # Arbiter Tests
 # =============================================================================
@@ -94,28 +141,16 @@ async def test_arbiter_rx_only(dut):
     # Enable only RX monitoring
     await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, 0x01)
 
-    # Inject RX TLPs
-    for i in range(3):
-        beats = TLPBuilder.memory_read_32(
-            address=0x100 + i * 4,
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i,
-        )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 50)
+    # Inject RX TLPs back-to-back
+    tlps = [TLPBuilder.memory_read_32_cached(address=0x100 + i * 4, tag=i) for i in range(3)]
+    await pcie_bfm.inject_tlp_burst(tlps, bar_hit=0b000001)
 
     # Capture packets
-    rx_count = 0
-    for i in range(3):
-        packet_data = await usb_bfm.receive_monitor_packet(timeout_cycles=300)
-        assert packet_data is not None, f"Expected to capture RX packet {i+1}/3"
-        pkt = parse_monitor_packet(packet_data)
-        assert pkt.direction == Direction.RX, "Expected RX packet"
-        rx_count += 1
+    pkts = parse_monitor_packets(await usb_bfm.capture_n(3, idle_cycles=300))
+    assert len(pkts) == 3, f"Expected to capture 3 RX packets, got {len(pkts)}"
+    assert all(pkt.direction == Direction.RX for pkt in pkts), "Expected RX packets only"
 
-    dut._log.info(f"Captured {rx_count} RX-only packets")
-    assert rx_count == 3, f"Expected to capture all 3 RX packets, got {rx_count}"
+    dut._log.info(f"Captured {len(pkts)} RX-only packets")
 
 
 @cocotb.test()
@@ -161,32 +196,14 @@ async def test_arbiter_interleaved_traffic(dut):
     await enable_both_monitoring(usb_bfm)
 
     # Generate both RX traffic (reads) and potential TX traffic (completions)
-    for i in range(5):
-        # RX: Memory read to BAR0
-        beats = TLPBuilder.memory_read_32(
-            address=0x048,  # ID register - will generate completion
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i,
-        )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 30)
+    # RX: Memory reads to BAR0 ID register - each will generate a completion
+    tlps = [TLPBuilder.memory_read_32_cached(address=0x048, tag=i) for i in range(5)]
+    await pcie_bfm.inject_tlp_burst(tlps, bar_hit=0b000001, min_gap=_MRD_CPL_GAP)
 
     await ClockCycles(dut.sys_clk, 200)
 
-    # Capture all packets
-    rx_packets = []
-    tx_packets = []
-
-    for _ in range(10):  # Try to capture up to 10 packets
-        packet_data = await usb_bfm.receive_monitor_packet(timeout_cycles=200)
-        if packet_data is None:
-            break
-        pkt = parse_monitor_packet(packet_data)
-        if pkt.direction == Direction.RX:
-            rx_packets.append(pkt)
-        else:
-            tx_packets.append(pkt)
+    # Capture packets (up to 10) until both RX and TX targets are met
+    rx_packets, tx_packets = await capture_rx_tx(usb_bfm, min_rx=4, min_tx=4, max_packets=10)
 
     dut._log.info(f"Captured {len(rx_packets)} RX packets, {len(tx_packets)} TX packets")
 
@@ -210,7 +227,7 @@ async def test_arbiter_packet_atomicity(dut):
     await enable_both_monitoring(usb_bfm)
 
     # Inject a multi-DWORD write (larger payload)
-    write_data = bytes([i for i in range(16)])  # 16 bytes = 4 DWORDs
+    write_data = _WRITE_DATA_16  # 16 bytes = 4 DWORDs
     beats = TLPBuilder.memory_write_32(
         address=0x100,
         data_bytes=write_data,
@@ -247,34 +264,29 @@ async def test_arbiter_under_load(dut):
 
     await enable_both_monitoring(usb_bfm)
 
-    NUM_TLPS = 10
-
-    # Inject many TLPs rapidly
-    for i in range(NUM_TLPS):
-        beats = TLPBuilder.memory_read_32(
-            address=0x100 + (i % 8) * 4,
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i % 32,
-        )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 10)  # Rapid injection
-
-    await ClockCycles(dut.sys_clk, 300)
+    # Inject many TLPs rapidly while draining the monitor stream, so the
+    # capture side overlaps injection instead of waiting for it to finish
+    async def _inject_loop():
+        beats = TLPBuilder.make_memory_read_32_template()
+        for i in range(NUM_TLPS):
+            TLPBuilder.patch_memory_read_32(beats, address=0x100 + (i % 8) * 4, tag=i % 32)
+            await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
+            await ClockCycles(dut.sys_clk, 10)  # Rapid injection
+
+    # Allow for some TX completions too
+    packets = [None] * (NUM_TLPS + 5)
+    drain_task = cocotb.start_soon(usb_bfm.drain_into(packets, idle_cycles=200))
+    inject_task = cocotb.start_soon(_inject_loop())
+    await Combine(inject_task, drain_task)
 
     # Count captured packets
-    captured = 0
-    for _ in range(NUM_TLPS + 5):  # Allow for some TX completions too
-        packet_data = await usb_bfm.receive_monitor_packet(timeout_cycles=200)
-        if packet_data is None:
-            break
-        captured += 1
+    captured = await drain_task
 
     dut._log.info(f"Captured {captured} packets under load")
 
     # Should capture most of the injected TLPs
-    assert captured >= NUM_TLPS * 0.8, \
-        f"Expected to capture at least {int(NUM_TLPS * 0.8)} packets under load, got {captured}"
+    assert captured >= _MIN_CAPTURED, \
+        f"Expected to capture at least {_MIN_CAPTURED} packets under load, got {captured}"
 
 
 @cocotb.test()
@@ -291,31 +303,17 @@ async def test_arbiter_fair_scheduling(dut):
     await enable_both_monitoring(usb_bfm)
 
     # Inject RX traffic that will also generate TX completions
-    for i in range(5):
-        beats = TLPBuilder.memory_read_32(
-            address=0x048,  # ID register - generates completion
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i,
-        )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 50)
+    # (reads of the ID register)
+    tlps = [TLPBuilder.memory_read_32_cached(address=0x048, tag=i) for i in range(5)]
+    await pcie_bfm.inject_tlp_burst(tlps, bar_hit=0b000001, min_gap=_MRD_CPL_GAP)
 
     await ClockCycles(dut.sys_clk, 300)
 
-    # Capture packets and check for TX
-    rx_seen = 0
-    tx_seen = 0
+    # Capture packets (up to 15) until both RX and TX targets are met
+    rx_packets, tx_packets = await capture_rx_tx(usb_bfm, min_rx=4, min_tx=4, max_packets=15)
 
-    for _ in range(15):
-        packet_data = await usb_bfm.receive_monitor_packet(timeout_cycles=200)
-        if packet_data is None:
-            break
-        pkt = parse_monitor_packet(packet_data)
-        if pkt.direction == Direction.RX:
-            rx_seen += 1
-        else:
-            tx_seen += 1
+    rx_seen = len(rx_packets)
+    tx_seen = len(tx_packets)
 
     dut._log.info(f"Fair scheduling: RX={rx_seen}, TX={tx_seen}")
 
@@ -343,18 +341,11 @@ async def test_arbiter_counters(dut):
     dut._log.info(f"Initial counters: RX={initial_rx}, TX={initial_tx}")
 
     # Generate some RX traffic
-    for i in range(3):
-        beats = TLPBuilder.memory_read_32(
-            address=0x100,
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i,
-        )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 50)
-
-        # Drain monitor packets to allow counter updates
-        await usb_bfm.receive_monitor_packet(timeout_cycles=200)
+    tlps = [TLPBuilder.memory_read_32_cached(address=0x100, tag=i) for i in range(3)]
+    await pcie_bfm.inject_tlp_burst(tlps, bar_hit=0b000001)
+
+    # Drain monitor packets to allow counter updates
+    await usb_bfm.capture_n(3, idle_cycles=200)
 
     await ClockCycles(dut.sys_clk, 100)
 
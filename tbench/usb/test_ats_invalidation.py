@@ -10,17 +10,14 @@
 # - Sending Invalidation Completion responses
 #
 
-import cocotb
-from cocotb.clock import Clock
-from cocotb.triggers import ClockCycles
-
-import sys
-import os
+import logging
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import cocotb
+from cocotb.triggers import ClockCycles, Combine, First, RisingEdge
 
 from tbench.common.usb_bfm import USBBFM
 from tbench.common.pcie_bfm import PCIeBFM
+from tbench.common import reset
 from tbench.common.tlp_builder import TLPBuilder, ATS_PERM_RW
 
 from bsa_pcie_exerciser.common.protocol import (
@@ -66,26 +63,16 @@ ATSCTL_INVALIDATED  = (1 << 9)
 # Test Utilities
 # =============================================================================
 
-async def reset_dut(dut):
-    """Reset and initialize clocks."""
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
-    cocotb.start_soon(Clock(dut.pcie_clk, 8, unit="ns").start())
-    cocotb.start_soon(Clock(dut.usb_clk, 10, unit="ns").start())
-
-    dut.sys_rst.value = 1
-    dut.pcie_rst.value = 1
-    dut.usb_rst.value = 1
-
-    dut.phy_rx_valid.value = 0
-    dut.phy_tx_ready.value = 1
+# Flush the ATC, then clear the sticky INVALIDATED flag that the flush sets
+_ATS_SOFT_WRITES = (
+    (REG_ATSCTL, ATSCTL_CLEAR_ATC),
+    (REG_ATSCTL, ATSCTL_INVALIDATED),
+)
 
-    await ClockCycles(dut.sys_clk, 20)
 
-    dut.sys_rst.value = 0
-    dut.pcie_rst.value = 0
-    dut.usb_rst.value = 0
-
-    await ClockCycles(dut.sys_clk, 50)
+async def start_test(dut, mode: str = "full"):
+    """Reset the DUT and build the BFMs, clearing ATS state after a soft reset."""
+    return await reset.start_test(dut, mode, soft_writes=_ATS_SOFT_WRITES)
 
 
 async def enable_ats_capability(pcie_bfm: PCIeBFM):
@@ -118,23 +105,53 @@ async def enable_both_monitoring(usb_bfm: USBBFM):
     await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, 0x03)
 
 
+# Tag location as (beat index, bit shift), indexed by PASID prefix presence:
+# - No prefix: DW1 is in upper 32 bits of beat 0, tag at DW1[15:8]
+# - With PASID prefix: TLP DW1 is in lower 32 bits of beat 1
+_TAG_LOCATION = ((0, 40), (1, 8))
+
+
+async def wait_for_ats_success(dut, timeout_cycles: int = 200) -> bool:
+    """
+    Wait for the ATS engine to report a successful translation.
+
+    Blocks on the ats_success observation port exposed by tb_usb rather
+    than polling ATSCTL over Etherbone.
+
+    Returns:
+        True if success was seen before the timeout
+    """
+    if not dut.ats_success.value:
+        await First(RisingEdge(dut.ats_success), ClockCycles(dut.sys_clk, timeout_cycles))
+    return bool(dut.ats_success.value)
+
+
+async def wait_for_invalidation(dut, timeout_cycles: int = 200) -> bool:
+    """
+    Wait for the ATC to be invalidated.
+
+    atc_invalidated is a single-cycle strobe, so this returns on the edge
+    rather than after a fixed delay. Falls back to the full timeout if the
+    strobe has already fired; ATSCTL.INVALIDATED is sticky, so the register
+    read that follows still observes it.
+
+    Returns:
+        True if the invalidation strobe was seen before the timeout
+    """
+    timeout = ClockCycles(dut.sys_clk, timeout_cycles)
+    fired = await First(RisingEdge(dut.atc_invalidated), timeout)
+    return fired is not timeout
+
+
 def extract_tag_from_tlp(beats):
     """Extract tag from a TLP (handles PASID prefix)."""
     if not beats:
         return None
 
-    # Check first DWORD for PASID prefix
-    dw0 = beats[0]['dat'] & 0xFFFFFFFF
-    has_pasid_prefix = ((dw0 >> 24) & 0xFF) == 0x91
-
-    if has_pasid_prefix:
-        # With PASID prefix: TLP DW1 is in lower 32 bits of beat 1
-        tlp_dw1 = beats[1]['dat'] & 0xFFFFFFFF
-        return (tlp_dw1 >> 8) & 0xFF
-    else:
-        # No prefix: DW1 is in upper 32 bits of beat 0
-        dw1 = (beats[0]['dat'] >> 32) & 0xFFFFFFFF
-        return (dw1 >> 8) & 0xFF
+    # PASID prefix is marked by 0x91 in DW0[31:24]
+    has_pasid_prefix = ((beats[0]['dat'] >> 24) & 0xFF) == 0x91
+    beat_idx, shift = _TAG_LOCATION[has_pasid_prefix]
+    return (beats[beat_idx]['dat'] >> shift) & 0xFF
 
 
 async def populate_atc_entry(usb_bfm: USBBFM, pcie_bfm: PCIeBFM, address: int,
@@ -150,12 +167,12 @@ async def populate_atc_entry(usb_bfm: USBBFM, pcie_bfm: PCIeBFM, address: int,
     Note: The TLPController in the crossbar replaces the ATS engine's tag with
     its own managed tag, so we must capture the outgoing TLP to get the real tag.
     """
-    # Set address for translation
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_LO, address & 0xFFFFFFFF)
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_HI, (address >> 32) & 0xFFFFFFFF)
-
-    # Trigger ATS translation request
-    await usb_bfm.send_etherbone_write(REG_ATSCTL, ATSCTL_TRIGGER)
+    # Set address for translation and trigger ATS translation request
+    await usb_bfm.send_etherbone_write_burst([
+        (REG_DMA_BUS_ADDR_LO, address & 0xFFFFFFFF),
+        (REG_DMA_BUS_ADDR_HI, (address >> 32) & 0xFFFFFFFF),
+        (REG_ATSCTL, ATSCTL_TRIGGER),
+    ])
 
     # Capture the outgoing ATS request TLP to get the actual tag
     # The TLPController replaces the ATS engine's tag with its own
@@ -169,7 +186,7 @@ async def populate_atc_entry(usb_bfm: USBBFM, pcie_bfm: PCIeBFM, address: int,
     usb_bfm.dut._log.info(f"Captured ATS request with tag={actual_tag}")
 
     # Inject ATS Translation Completion with the captured tag
-    cpl_beats = TLPBuilder.ats_translation_completion(
+    cpl_beats = TLPBuilder.ats_translation_completion_cached(
         requester_id=0x0100,  # Our device ID
         completer_id=0x0000,  # Root complex/SMMU
         tag=actual_tag,       # Use captured tag, not ATS engine's internal tag
@@ -187,6 +204,26 @@ async def populate_atc_entry(usb_bfm: USBBFM, pcie_bfm: PCIeBFM, address: int,
     return (atsctl & ATSCTL_SUCCESS) != 0
 
 
+async def setup_ats_test(usb_bfm: USBBFM, pcie_bfm: PCIeBFM, address: int,
+                         translated_addr: int, monitor: bool = False):
+    """
+    Enable ATS (and optionally monitoring), then populate an ATC entry.
+
+    The config-space ATS enable goes over PCIe and the monitor enable over
+    Etherbone, so the two are issued concurrently; the ATC population
+    only starts once both have completed.
+
+    Returns:
+        True if the ATC entry was populated successfully
+    """
+    tasks = [cocotb.start_soon(enable_ats_capability(pcie_bfm))]
+    if monitor:
+        tasks.append(cocotb.start_soon(enable_both_monitoring(usb_bfm)))
+    await Combine(*tasks)
+
+    return await populate_atc_entry(usb_bfm, pcie_bfm, address, translated_addr)
+
+
 def parse_monitor_packet(data: bytes) -> TLPPacket:
     """Parse a USB monitor packet into TLPPacket."""
     pkt = parse_tlp_packet(data)
@@ -210,17 +247,12 @@ async def test_ats_invalidation_request_clears_atc(dut):
     2. Inject ATS Invalidation Request message via PCIe
     3. Verify ATC entry is cleared (invalidated status set)
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut)
 
-    # Enable ATS capability in config space (required for ATS engine to work)
-    await enable_ats_capability(pcie_bfm)
-
-    # Populate ATC with a translation
+    # Enable ATS and populate ATC with a translation
     test_addr = 0x10000000
     translated = 0x20000000
-    success = await populate_atc_entry(usb_bfm, pcie_bfm, test_addr, translated)
+    success = await setup_ats_test(usb_bfm, pcie_bfm, test_addr, translated)
 
     assert success, "ATC population failed - cannot test invalidation"
 
@@ -233,7 +265,7 @@ async def test_ats_invalidation_request_clears_atc(dut):
     # Inject ATS Invalidation Request
     # requester_id = Translation Agent (e.g., root complex)
     # device_id = Our device ID (target)
-    inv_beats = TLPBuilder.ats_invalidation_request(
+    inv_beats = TLPBuilder.ats_invalidation_request_cached(
         requester_id=0x0000,  # Root complex
         device_id=0x0100,     # Our endpoint
         itag=0x01,
@@ -243,7 +275,7 @@ async def test_ats_invalidation_request_clears_atc(dut):
     await pcie_bfm.inject_tlp(inv_beats, bar_hit=0)
 
     # Wait for invalidation to be processed
-    await ClockCycles(dut.sys_clk, 200)
+    await wait_for_invalidation(dut, timeout_cycles=200)
 
     # Check invalidated status
     atsctl = await usb_bfm.send_etherbone_read(REG_ATSCTL)
@@ -263,23 +295,16 @@ async def test_ats_invalidation_completion_sent(dut):
     3. Inject Invalidation Request
     4. Capture outgoing Invalidation Completion message
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
-
-    # Enable ATS capability in config space (required for ATS engine to work)
-    await enable_ats_capability(pcie_bfm)
-
-    await enable_both_monitoring(usb_bfm)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
 
-    # Populate ATC
+    # Enable ATS and monitoring, then populate ATC
     test_addr = 0x30000000
-    success = await populate_atc_entry(usb_bfm, pcie_bfm, test_addr, 0x40000000)
+    success = await setup_ats_test(usb_bfm, pcie_bfm, test_addr, 0x40000000, monitor=True)
 
     assert success, "ATC population failed - cannot test invalidation completion"
 
     # Inject ATS Invalidation Request
-    inv_beats = TLPBuilder.ats_invalidation_request(
+    inv_beats = TLPBuilder.ats_invalidation_request_cached(
         requester_id=0x0000,
         device_id=0x0100,
         itag=0x05,
@@ -310,16 +335,11 @@ async def test_ats_software_atc_clear(dut):
     This test verifies the baseline ATC clear functionality
     that's triggered via register write (not PCIe message).
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
 
-    # Enable ATS capability in config space (required for ATS engine to work)
-    await enable_ats_capability(pcie_bfm)
-
-    # Populate ATC
+    # Enable ATS and populate ATC
     test_addr = 0x50000000
-    success = await populate_atc_entry(usb_bfm, pcie_bfm, test_addr, 0x60000000)
+    success = await setup_ats_test(usb_bfm, pcie_bfm, test_addr, 0x60000000)
 
     assert success, "ATC population failed - cannot test software clear"
 
@@ -349,18 +369,13 @@ async def test_ats_global_invalidation(dut):
     2. Send global invalidation (G=1)
     3. Verify entry is cleared
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
-
-    # Enable ATS capability in config space (required for ATS engine to work)
-    await enable_ats_capability(pcie_bfm)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
 
     # Use a different address than other tests to avoid confusion
     test_addr = 0x70000000
 
-    # Populate ATC using helper (without PASID)
-    success = await populate_atc_entry(usb_bfm, pcie_bfm, test_addr, 0x80000000)
+    # Enable ATS and populate ATC (without PASID)
+    success = await setup_ats_test(usb_bfm, pcie_bfm, test_addr, 0x80000000)
     assert success, "Failed to populate ATC"
 
     dut._log.info(f"ATC populated: 0x{test_addr:08X} -> 0x80000000")
@@ -371,7 +386,7 @@ async def test_ats_global_invalidation(dut):
         await usb_bfm.send_etherbone_write(REG_ATSCTL, ATSCTL_INVALIDATED)  # Clear sticky bit
 
     # Send global invalidation (G=1)
-    inv_beats = TLPBuilder.ats_invalidation_request(
+    inv_beats = TLPBuilder.ats_invalidation_request_cached(
         requester_id=0x0000,
         device_id=0x0100,
         itag=0x06,
@@ -380,7 +395,7 @@ async def test_ats_global_invalidation(dut):
     )
     await pcie_bfm.inject_tlp(inv_beats, bar_hit=0)
 
-    await ClockCycles(dut.sys_clk, 200)
+    await wait_for_invalidation(dut, timeout_cycles=200)
 
     atsctl = await usb_bfm.send_etherbone_read(REG_ATSCTL)
     invalidated = (atsctl & ATSCTL_INVALIDATED) != 0
@@ -398,21 +413,16 @@ async def test_ats_page_selective_invalidation(dut):
     Note: This test verifies the S=0 (single 4KB page) case.
     Extended range invalidation (S=1) is not implemented.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
-
-    # Enable ATS capability in config space (required for ATS engine to work)
-    await enable_ats_capability(pcie_bfm)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
 
-    # Populate ATC with entry at specific address
+    # Enable ATS and populate ATC with entry at specific address
     test_addr = 0x90000000
-    success = await populate_atc_entry(usb_bfm, pcie_bfm, test_addr, 0xA0000000)
+    success = await setup_ats_test(usb_bfm, pcie_bfm, test_addr, 0xA0000000)
 
     assert success, "ATC population failed - cannot test page-selective invalidation"
 
     # Send invalidation for the EXACT same address
-    inv_beats = TLPBuilder.ats_invalidation_request(
+    inv_beats = TLPBuilder.ats_invalidation_request_cached(
         requester_id=0x0000,
         device_id=0x0100,
         itag=0x07,
@@ -422,7 +432,7 @@ async def test_ats_page_selective_invalidation(dut):
     )
     await pcie_bfm.inject_tlp(inv_beats, bar_hit=0)
 
-    await ClockCycles(dut.sys_clk, 200)
+    await wait_for_invalidation(dut, timeout_cycles=200)
 
     atsctl = await usb_bfm.send_etherbone_read(REG_ATSCTL)
     invalidated = (atsctl & ATSCTL_INVALIDATED) != 0
@@ -445,24 +455,22 @@ async def test_ats_global_invalidation_with_pasid(dut):
     3. Send global invalidation (G=1)
     4. Verify entry is cleared
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
 
     # Enable ATS capability in config space (required for ATS engine to work)
     await enable_ats_capability(pcie_bfm)
 
-    # Set a PASID value
-    test_pasid = 0x1234
-    await usb_bfm.send_etherbone_write(REG_PASID_VAL, test_pasid)
-
     # Populate ATC with PASID-enabled entry
+    test_pasid = 0x1234
     test_addr = 0x70000000
 
-    # Configure for PASID-enabled ATS request
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_LO, test_addr)
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_HI, 0)
-    await usb_bfm.send_etherbone_write(REG_ATSCTL, ATSCTL_TRIGGER | ATSCTL_PASID_EN)
+    # Set PASID value and configure for PASID-enabled ATS request
+    await usb_bfm.send_etherbone_write_burst([
+        (REG_PASID_VAL, test_pasid),
+        (REG_DMA_BUS_ADDR_LO, test_addr),
+        (REG_DMA_BUS_ADDR_HI, 0),
+        (REG_ATSCTL, ATSCTL_TRIGGER | ATSCTL_PASID_EN),
+    ])
 
     # Capture the outgoing ATS request TLP to get the actual tag
     beats = await pcie_bfm.capture_tlp(timeout_cycles=500)
@@ -470,15 +478,18 @@ async def test_ats_global_invalidation_with_pasid(dut):
         dut._log.warning("Failed to capture ATS request TLP")
         assert False, "Failed to capture PASID-enabled ATS request"
 
+    debug = dut._log.isEnabledFor(logging.DEBUG)
+
     # Debug: print raw beats for analysis
-    for i, beat in enumerate(beats):
-        dut._log.info(f"  Beat {i}: dat=0x{beat['dat']:016X} be=0x{beat['be']:02X} "
-                      f"first={beat['first']} last={beat['last']}")
+    if debug:
+        for i, beat in enumerate(beats):
+            dut._log.debug(f"  Beat {i}: dat=0x{beat['dat']:016X} be=0x{beat['be']:02X} "
+                           f"first={beat['first']} last={beat['last']}")
 
-    # Check for PASID prefix
-    dw0 = beats[0]['dat'] & 0xFFFFFFFF
-    has_pasid = ((dw0 >> 24) & 0xFF) == 0x91
-    dut._log.info(f"  PASID prefix detected: {has_pasid} (dw0=0x{dw0:08X})")
+        # Check for PASID prefix
+        dw0 = beats[0]['dat'] & 0xFFFFFFFF
+        has_pasid = ((dw0 >> 24) & 0xFF) == 0x91
+        dut._log.debug(f"  PASID prefix detected: {has_pasid} (dw0=0x{dw0:08X})")
 
     # Extract tag from captured TLP (handles PASID prefix if present)
     actual_tag = extract_tag_from_tlp(beats)
@@ -490,7 +501,7 @@ async def test_ats_global_invalidation_with_pasid(dut):
                   f"(in_flight={(atsctl_before & ATSCTL_IN_FLIGHT) != 0})")
 
     # Inject translation completion with the captured tag
-    cpl_beats = TLPBuilder.ats_translation_completion(
+    cpl_beats = TLPBuilder.ats_translation_completion_cached(
         requester_id=0x0100,
         completer_id=0x0000,
         tag=actual_tag,
@@ -499,22 +510,21 @@ async def test_ats_global_invalidation_with_pasid(dut):
     )
 
     # Debug: print completion beats
-    dut._log.info("Injecting completion TLP:")
-    for i, beat in enumerate(cpl_beats):
-        dut._log.info(f"  Cpl Beat {i}: dat=0x{beat['dat']:016X} be=0x{beat['be']:02X}")
+    if debug:
+        dut._log.debug("Injecting completion TLP:")
+        for i, beat in enumerate(cpl_beats):
+            dut._log.debug(f"  Cpl Beat {i}: dat=0x{beat['dat']:016X} be=0x{beat['be']:02X}")
 
     await pcie_bfm.inject_tlp(cpl_beats, bar_hit=0)
 
-    # Wait and check status periodically
-    for wait_cycle in [10, 50, 100]:
-        await ClockCycles(dut.sys_clk, wait_cycle - (10 if wait_cycle > 10 else 0))
-        atsctl_check = await usb_bfm.send_etherbone_read(REG_ATSCTL)
-        dut._log.info(f"ATSCTL after {wait_cycle} cycles: 0x{atsctl_check:08X} "
-                      f"(in_flight={(atsctl_check & ATSCTL_IN_FLIGHT) != 0}, "
-                      f"success={(atsctl_check & ATSCTL_SUCCESS) != 0})")
+    # Wait for the completion to be processed
+    await wait_for_ats_success(dut, timeout_cycles=200)
 
     # Verify ATC was populated
     atsctl = await usb_bfm.send_etherbone_read(REG_ATSCTL)
+    dut._log.info(f"ATSCTL after completion: 0x{atsctl:08X} "
+                  f"(in_flight={(atsctl & ATSCTL_IN_FLIGHT) != 0}, "
+                  f"success={(atsctl & ATSCTL_SUCCESS) != 0})")
     if not (atsctl & ATSCTL_SUCCESS):
         dut._log.warning(f"PASID-enabled ATC population failed (ATSCTL=0x{atsctl:08X})")
         assert False, "PASID-enabled ATS translation completion not processed - known issue"
@@ -526,7 +536,7 @@ async def test_ats_global_invalidation_with_pasid(dut):
         await usb_bfm.send_etherbone_write(REG_ATSCTL, ATSCTL_INVALIDATED)
 
     # Send global invalidation (should clear regardless of PASID)
-    inv_beats = TLPBuilder.ats_invalidation_request(
+    inv_beats = TLPBuilder.ats_invalidation_request_cached(
         requester_id=0x0000,
         device_id=0x0100,
         itag=0x06,
@@ -535,7 +545,7 @@ async def test_ats_global_invalidation_with_pasid(dut):
     )
     await pcie_bfm.inject_tlp(inv_beats, bar_hit=0)
 
-    await ClockCycles(dut.sys_clk, 200)
+    await wait_for_invalidation(dut, timeout_cycles=200)
 
     atsctl = await usb_bfm.send_etherbone_read(REG_ATSCTL)
     invalidated = (atsctl & ATSCTL_INVALIDATED) != 0
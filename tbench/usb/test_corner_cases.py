@@ -13,17 +13,15 @@
 #
 
 import cocotb
-from cocotb.clock import Clock
-from cocotb.triggers import ClockCycles, RisingEdge
+from cocotb.queue import Queue
+from cocotb.triggers import ClockCycles, First, RisingEdge
 from cocotb.utils import get_sim_time
 
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import logging
+from collections import Counter
 
 from tbench.common.usb_bfm import USBBFM
-from tbench.common.pcie_bfm import PCIeBFM
+from tbench.common import reset
 from tbench.common.tlp_builder import TLPBuilder
 
 from bsa_pcie_exerciser.common.protocol import (
@@ -40,40 +38,53 @@ REG_USB_MON_CTRL = 0x080
 REG_USB_MON_RX_CAPTURED = 0x088
 REG_USB_MON_RX_DROPPED = 0x08C
 
+SYS_CLK_PERIOD_NS = 8
 
-# =============================================================================
-# Test Utilities
-# =============================================================================
+# Incrementing payload pattern; sweeps slice the sizes they need from it
+_PAYLOAD_PATTERN = bytes(range(256))
 
-async def reset_dut(dut):
-    """Reset and initialize clocks."""
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
-    cocotb.start_soon(Clock(dut.pcie_clk, 8, unit="ns").start())
-    cocotb.start_soon(Clock(dut.usb_clk, 10, unit="ns").start())
+# Fixed single-DWORD payload for tests that only care about the header
+_ATTR_PAYLOAD = b'\xAB' * 4
 
-    dut.sys_rst.value = 1
-    dut.pcie_rst.value = 1
-    dut.usb_rst.value = 1
 
-    dut.phy_rx_valid.value = 0
-    dut.phy_tx_ready.value = 1
+# =============================================================================
+# Test Utilities
+# =============================================================================
 
-    await ClockCycles(dut.sys_clk, 20)
+async def start_test(dut, mode: str = "full"):
+    """Reset the DUT and build the BFMs, with sys_clk at SYS_CLK_PERIOD_NS."""
+    return await reset.start_test(dut, mode, sys_clk_period_ns=SYS_CLK_PERIOD_NS)
 
-    dut.sys_rst.value = 0
-    dut.pcie_rst.value = 0
-    dut.usb_rst.value = 0
 
-    await ClockCycles(dut.sys_clk, 50)
+async def clear_and_enable(usb_bfm: USBBFM, rx=True, tx=True):
+    """
+    Clear stats and enable monitoring.
 
+    Returns as soon as the enable lands in the design, so the caller can
+    start injecting while the BFM's post-write settle delay runs on in the
+    background.
 
-async def clear_and_enable(usb_bfm: USBBFM, rx=True, tx=True):
-    """Clear stats and enable monitoring."""
-    ctrl = (0x01 if rx else 0) | (0x02 if tx else 0) | 0x04  # + clear bit
-    await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, ctrl)
-    await ClockCycles(usb_bfm.clk, 5)
-    ctrl = (0x01 if rx else 0) | (0x02 if tx else 0)
-    await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, ctrl)
+    Returns:
+        The Etherbone write task, for callers that need it fully complete
+    """
+    dut = usb_bfm.dut
+    # Bit 2 (clear) auto-clears in hardware and leaves the enable bits set,
+    # so a single write both clears stats and enables capture
+    ctrl = (0x01 if rx else 0) | (0x02 if tx else 0) | 0x04
+    write_task = cocotb.start_soon(usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, ctrl))
+
+    # Clear and enable come from the same write, so an enable rising edge
+    # means both have landed. If already enabled there is no edge to see.
+    edges = []
+    if rx and not int(dut.usb_mon_rx_enable.value):
+        edges.append(RisingEdge(dut.usb_mon_rx_enable))
+    if tx and not int(dut.usb_mon_tx_enable.value):
+        edges.append(RisingEdge(dut.usb_mon_tx_enable))
+    if edges:
+        await First(*edges, write_task)
+    else:
+        await write_task
+    return write_task
 
 
 async def get_monitor_stats(usb_bfm: USBBFM) -> dict:
@@ -84,16 +95,84 @@ async def get_monitor_stats(usb_bfm: USBBFM) -> dict:
     }
 
 
+async def wait_for_rx_captured_stable(dut, interval=100, timeout_cycles=2500) -> int:
+    """
+    Wait until the monitor's RX captured count stops changing.
+
+    Samples the usb_mon_rx_captured observation port every interval cycles
+    instead of sleeping for a worst-case settle time.
+
+    Returns:
+        The settled RX captured count
+    """
+    sys_clk = dut.sys_clk
+    prev = -1
+    for _ in range(timeout_cycles // interval):
+        await ClockCycles(sys_clk, interval)
+        cur = int(dut.usb_mon_rx_captured.value)
+        if cur == prev:
+            return cur
+        prev = cur
+    raise TimeoutError(f"RX captured count still changing after {timeout_cycles} cycles")
+
+
+async def _rx_producer(usb_bfm: USBBFM, queue: Queue, max_packets: int,
+                       first_timeout: int, timeout_per_packet: int,
+                       min_quiet: int, debug: bool):
+    """
+    Receive raw monitor packets into queue, ending with a None sentinel.
+
+    Once two packets have arrived, the timeout tightens to four times the
+    longest gap seen between packets (bounded by min_quiet and
+    timeout_per_packet), so the drain stops soon after the stream goes quiet.
+    """
+    timeout = first_timeout
+    last_ns = None
+    max_gap = 0
+    for _ in range(max_packets):
+        data = await usb_bfm.receive_monitor_packet(timeout_cycles=timeout, debug=debug)
+        if data is None:
+            break
+        now_ns = get_sim_time('ns')
+        await queue.put(data)
+
+        if last_ns is None:
+            timeout = timeout_per_packet
+        else:
+            max_gap = max(max_gap, int(now_ns - last_ns) // SYS_CLK_PERIOD_NS)
+            timeout = min(timeout_per_packet, max(min_quiet, 4 * max_gap))
+        last_ns = now_ns
+    await queue.put(None)
+
+
 async def drain_monitor_packets(usb_bfm: USBBFM, max_packets=1000,
-                                timeout_per_packet=500, debug=False) -> list:
-    """Drain all pending monitor packets."""
+                                timeout_per_packet=500, settle_cycles=1000,
+                                min_quiet=64, debug=False) -> list:
+    """
+    Drain all pending monitor packets.
+
+    Returns as soon as the monitor stream goes idle, so callers don't need
+    a fixed settle delay first: the first packet may take up to
+    settle_cycles + timeout_per_packet to arrive. After that the idle
+    timeout adapts to the observed packet spacing, between min_quiet and
+    timeout_per_packet cycles.
+
+    Reception runs in a producer task feeding a small queue, so the USB
+    side keeps being serviced while earlier packets are parsed here.
+    """
+    queue = Queue(maxsize=4)
+    producer = cocotb.start_soon(
+        _rx_producer(usb_bfm, queue, max_packets, settle_cycles + timeout_per_packet,
+                     timeout_per_packet, min_quiet, debug))
+
     packets = []
-    while len(packets) < max_packets:
-        data = await usb_bfm.receive_monitor_packet(timeout_cycles=timeout_per_packet, debug=debug)
+    while True:
+        data = await queue.get()
         if data is None:
             break
         pkt = parse_tlp_packet(data)
         if pkt is None:
+            producer.cancel()
             raise AssertionError("Malformed monitor packet encountered during drain")
         packets.append(pkt)
     return packets
@@ -111,9 +190,7 @@ async def test_header_only_mrd_single(dut):
     This tests the arbiter's header_last fix - header-only packets must
     assert last on the final header word.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut)
 
     await clear_and_enable(usb_bfm, rx=True, tx=False)
 
@@ -146,25 +223,18 @@ async def test_header_only_mrd_burst(dut):
 
     Tests arbiter handling multiple header-only packets in sequence.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
+    sys_clk = dut.sys_clk
 
     await clear_and_enable(usb_bfm, rx=True, tx=False)
 
     # Inject 20 MRd TLPs with enough gap for FIFO to drain
     # Header FIFO is 4-deep, so need ~50 cycles per packet for USB to drain
+    mrd = TLPBuilder.make_memory_read_32_template()
     for i in range(20):
-        beats = TLPBuilder.memory_read_32(
-            address=0x100 + i * 4,
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i,
-        )
+        beats = TLPBuilder.patch_memory_read_32(mrd, address=0x100 + i * 4, tag=i)
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 50)
-
-    await ClockCycles(dut.sys_clk, 1000)
+        await ClockCycles(sys_clk, 50)
 
     packets = await drain_monitor_packets(usb_bfm)
     stats = await get_monitor_stats(usb_bfm)
@@ -183,45 +253,39 @@ async def test_mixed_header_only_and_payload(dut):
     Tests arbiter correctly handles transitions between header-only
     and payload packets.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
+    sys_clk = dut.sys_clk
 
     await clear_and_enable(usb_bfm, rx=True, tx=False)
 
     mrd_count = 0
     mwr_count = 0
 
+    mrd = TLPBuilder.make_memory_read_32_template()
     for i in range(20):
         if i % 2 == 0:
             # MRd (header-only)
-            beats = TLPBuilder.memory_read_32(
-                address=0x100 + i * 4,
-                length_dw=1,
-                requester_id=0x0100,
-                tag=i,
-            )
+            beats = TLPBuilder.patch_memory_read_32(mrd, address=0x100 + i * 4, tag=i)
             mrd_count += 1
         else:
             # MWr (with payload)
             beats = TLPBuilder.memory_write_32(
                 address=0x200 + i * 4,
-                data_bytes=bytes([i] * 8),
+                data_bytes=bytes((i,)) * 8,
                 requester_id=0x0100,
                 tag=i,
             )
             mwr_count += 1
 
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 50)
-
-    await ClockCycles(dut.sys_clk, 1000)
+        await ClockCycles(sys_clk, 50)
 
     packets = await drain_monitor_packets(usb_bfm)
     stats = await get_monitor_stats(usb_bfm)
 
-    received_mrd = sum(1 for p in packets if p.tlp_type == TLPType.MRD)
-    received_mwr = sum(1 for p in packets if p.tlp_type == TLPType.MWR)
+    counts = Counter(p.tlp_type for p in packets)
+    received_mrd = counts[TLPType.MRD]
+    received_mwr = counts[TLPType.MWR]
 
     dut._log.info(f"Mixed packets: MRd={received_mrd}/{mrd_count}, MWr={received_mwr}/{mwr_count}")
 
@@ -231,100 +295,54 @@ async def test_mixed_header_only_and_payload(dut):
 
 
 # =============================================================================
-# CORNER CASE 2: Single-Beat Packet Drops
+# CORNER CASES 2 & 3: Drop Accounting Under Backpressure
 # =============================================================================
 
 @cocotb.test()
-async def test_single_beat_drop_counting(dut):
+@cocotb.parametrize(num_tlps=[20, 8])
+async def test_backpressure_drop_accounting(dut, num_tlps):
     """
-    Single-beat packets dropped when header FIFO full.
+    Single-beat MRd packets dropped while the USB side is blocked.
 
-    This tests the single_beat_drop fix - single-beat drops (first=last=1)
-    must use combinatorial detection since dropping flag is registered.
+    num_tlps=20: single-beat drops (first=last=1) must use combinatorial
+    detection since the dropping flag is registered, so every packet is
+    counted exactly once.
+
+    num_tlps=8: fills the 4-deep header FIFO to capacity plus a few more;
+    the FIFO contents are captured and the rest dropped.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
+    sys_clk = dut.sys_clk
 
     await clear_and_enable(usb_bfm, rx=True, tx=False)
 
-    # Apply backpressure to cause drops
+    # Block USB to prevent draining
     usb_bfm.set_backpressure(True)
 
     # Inject single-beat MRd TLPs (first=last=1)
-    for i in range(20):
-        beats = TLPBuilder.memory_read_32(
-            address=0x100 + i * 4,
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i,
-        )
+    mrd = TLPBuilder.make_memory_read_32_template()
+    for i in range(num_tlps):
+        beats = TLPBuilder.patch_memory_read_32(mrd, address=0x100 + i * 4, tag=i)
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 5)
+        await ClockCycles(sys_clk, 5)
 
-    await ClockCycles(dut.sys_clk, 100)
+    await ClockCycles(sys_clk, 100)
 
     # Release backpressure
     usb_bfm.set_backpressure(False)
-    await ClockCycles(dut.sys_clk, 500)
+    await ClockCycles(sys_clk, 500)
 
     stats = await get_monitor_stats(usb_bfm)
     packets = await drain_monitor_packets(usb_bfm)
 
     total = stats['rx_captured'] + stats['rx_dropped']
-    dut._log.info(f"Single-beat drops: captured={stats['rx_captured']}, "
-                  f"dropped={stats['rx_dropped']}, total={total}")
-
-    # Key assertion: total should equal injected count (no double-counting)
-    assert total == 20, f"Total should be 20, got {total} (double-counting bug)"
-
-
-# =============================================================================
-# CORNER CASE 3: FIFO Capacity Boundaries
-# =============================================================================
-
-@cocotb.test()
-async def test_header_fifo_exact_capacity(dut):
-    """
-    Fill header FIFO to exact capacity (4 entries).
-
-    Tests behavior at FIFO boundary - should capture 4, drop the rest.
-    """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
-
-    await clear_and_enable(usb_bfm, rx=True, tx=False)
-
-    # Block USB to prevent draining
-    usb_bfm.set_backpressure(True)
-
-    # Header FIFO is 4 deep (256-bit entries)
-    # Inject exactly 4 + a few more to test boundary
-    for i in range(8):
-        beats = TLPBuilder.memory_read_32(
-            address=0x100 + i * 4,
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i,
-        )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 5)
-
-    await ClockCycles(dut.sys_clk, 100)
-
-    usb_bfm.set_backpressure(False)
-    await ClockCycles(dut.sys_clk, 500)
-
-    stats = await get_monitor_stats(usb_bfm)
-    packets = await drain_monitor_packets(usb_bfm)
-
-    dut._log.info(f"FIFO capacity test: captured={stats['rx_captured']}, "
+    dut._log.info(f"Drop accounting ({num_tlps} TLPs): captured={stats['rx_captured']}, "
                   f"dropped={stats['rx_dropped']}, received={len(packets)}")
 
     # Should have captured some and dropped others
     assert stats['rx_captured'] > 0, "Should capture some packets"
-    assert stats['rx_captured'] + stats['rx_dropped'] == 8, "Total should be 8"
+    # Key assertion: total should equal injected count (no double-counting)
+    assert total == num_tlps, f"Total should be {num_tlps}, got {total} (double-counting bug)"
 
 
 # =============================================================================
@@ -338,30 +356,30 @@ async def test_payload_size_sweep(dut):
 
     Tests width converter handling of different sizes.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
 
     await clear_and_enable(usb_bfm, rx=True, tx=False)
 
     # Test sizes from 4 bytes (1 DW) to 64 bytes (16 DW)
     test_sizes = [4, 8, 12, 16, 20, 24, 28, 32, 48, 64]
 
-    for size in test_sizes:
-        payload = bytes([i & 0xFF for i in range(size)])
-        beats = TLPBuilder.memory_write_32(
+    tlps = [
+        TLPBuilder.memory_write_32(
             address=0x200,
-            data_bytes=payload,
+            data_bytes=_PAYLOAD_PATTERN[:size],
             requester_id=0x0100,
             tag=size,
         )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        # Larger packets need more USB drain time
-        await ClockCycles(dut.sys_clk, 100)
-
-    await ClockCycles(dut.sys_clk, 1000)
+        for size in test_sizes
+    ]
 
+    # Inject in the background and drain concurrently. The monitor drops
+    # rather than backpressures, so keep the gap: larger packets need more
+    # USB drain time.
+    inject_task = cocotb.start_soon(
+        pcie_bfm.inject_tlp_burst(tlps, bar_hit=0b000001, min_gap=100))
     packets = await drain_monitor_packets(usb_bfm)
+    await inject_task
     stats = await get_monitor_stats(usb_bfm)
 
     dut._log.info(f"Payload size sweep: captured={stats['rx_captured']}, received={len(packets)}")
@@ -369,9 +387,13 @@ async def test_payload_size_sweep(dut):
     assert len(packets) == len(test_sizes), f"Should receive {len(test_sizes)}, got {len(packets)}"
 
     # Verify payload lengths
+    if dut._log.isEnabledFor(logging.DEBUG):
+        dut._log.debug("\n".join(
+            f"Tag {pkt.tag}: payload_length={pkt.payload_length}, expected={(pkt.tag + 3) // 4}"
+            for pkt in packets))
+
     for pkt in packets:
         expected_dw = (pkt.tag + 3) // 4  # tag = size in bytes
-        dut._log.info(f"Tag {pkt.tag}: payload_length={pkt.payload_length}, expected={expected_dw}")
         assert pkt.payload_length == expected_dw, \
             f"Payload length mismatch for size {pkt.tag}: got {pkt.payload_length}, expected {expected_dw}"
 
@@ -388,9 +410,8 @@ async def test_address_bar_boundaries(dut):
     Addresses are masked to BAR-relative offsets by depacketizer.
     For 4KB BAR: 0x000-0xFFF are valid; addresses >= 0x1000 wrap.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
+    sys_clk = dut.sys_clk
 
     await clear_and_enable(usb_bfm, rx=True, tx=False)
 
@@ -403,17 +424,11 @@ async def test_address_bar_boundaries(dut):
         0xFFC,   # End of BAR (last aligned DWORD)
     ]
 
+    mrd = TLPBuilder.make_memory_read_32_template()
     for addr in test_addresses:
-        beats = TLPBuilder.memory_read_32(
-            address=addr,
-            length_dw=1,
-            requester_id=0x0100,
-            tag=addr & 0xFF,
-        )
+        beats = TLPBuilder.patch_memory_read_32(mrd, address=addr, tag=addr & 0xFF)
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 50)
-
-    await ClockCycles(dut.sys_clk, 1000)
+        await ClockCycles(sys_clk, 50)
 
     packets = await drain_monitor_packets(usb_bfm)
 
@@ -422,8 +437,12 @@ async def test_address_bar_boundaries(dut):
     assert len(packets) == len(test_addresses), f"Should receive {len(test_addresses)}"
 
     # Verify addresses match (they should be preserved within BAR range)
+    if dut._log.isEnabledFor(logging.DEBUG):
+        dut._log.debug("\n".join(
+            f"Expected 0x{expected_addr:04X}, got 0x{pkt.address:08X}"
+            for pkt, expected_addr in zip(packets, test_addresses)))
+
     for pkt, expected_addr in zip(packets, test_addresses):
-        dut._log.info(f"Expected 0x{expected_addr:04X}, got 0x{pkt.address:08X}")
         assert pkt.address == expected_addr, f"Address mismatch: 0x{pkt.address:08X} != 0x{expected_addr:04X}"
 
 
@@ -438,37 +457,33 @@ async def test_enable_disable_toggle(dut):
 
     Tests that enable/disable transitions don't cause corruption.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
+    sys_clk = dut.sys_clk
 
     total_injected = 0
 
+    mrd = TLPBuilder.make_memory_read_32_template()
     for cycle in range(5):
         # Enable
         await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, 0x01)
 
         # Inject some packets with enough gap
         for i in range(5):
-            beats = TLPBuilder.memory_read_32(
-                address=0x100 + i * 4,
-                length_dw=1,
-                requester_id=0x0100,
-                tag=cycle * 5 + i,
-            )
+            beats = TLPBuilder.patch_memory_read_32(mrd, address=0x100 + i * 4, tag=cycle * 5 + i)
             await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
             total_injected += 1
-            await ClockCycles(dut.sys_clk, 30)
+            await ClockCycles(sys_clk, 30)
 
         # Disable
         await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, 0x00)
-        await ClockCycles(dut.sys_clk, 50)
+        await ClockCycles(sys_clk, 50)
 
-    # Re-enable and drain
+    # Re-enable, then drain while waiting for capture to settle so the
+    # two waits overlap rather than run back to back
     await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, 0x01)
-    await ClockCycles(dut.sys_clk, 1000)
-
-    packets = await drain_monitor_packets(usb_bfm)
+    drain_task = cocotb.start_soon(drain_monitor_packets(usb_bfm))
+    await wait_for_rx_captured_stable(dut)
+    packets = await drain_task
     stats = await get_monitor_stats(usb_bfm)
 
     dut._log.info(f"Enable/disable toggle: injected={total_injected}, "
@@ -491,25 +506,17 @@ async def test_back_to_back_zero_gap(dut):
     Tests that the capture engine handles immediate first->first transitions.
     With a 4-entry header FIFO, some drops are expected under zero-gap injection.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
 
     await clear_and_enable(usb_bfm, rx=True, tx=False)
 
     # Inject 10 packets with no gap
+    mrd = TLPBuilder.make_memory_read_32_template()
     for i in range(10):
-        beats = TLPBuilder.memory_read_32(
-            address=0x100 + i * 4,
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i,
-        )
+        beats = TLPBuilder.patch_memory_read_32(mrd, address=0x100 + i * 4, tag=i)
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
         # No extra delay - just the inject_tlp handshakes
 
-    await ClockCycles(dut.sys_clk, 1000)
-
     packets = await drain_monitor_packets(usb_bfm)
     stats = await get_monitor_stats(usb_bfm)
 
@@ -532,9 +539,8 @@ async def test_tlp_attributes_preserved(dut):
     """
     Verify TLP attributes (No-Snoop, Relaxed Ordering, AT) are captured.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
+    sys_clk = dut.sys_clk
 
     await clear_and_enable(usb_bfm, rx=True, tx=False)
 
@@ -551,16 +557,14 @@ async def test_tlp_attributes_preserved(dut):
     for attr, at in attr_tests:
         beats = TLPBuilder.memory_write_32(
             address=0x200,
-            data_bytes=bytes([0xAB] * 4),
+            data_bytes=_ATTR_PAYLOAD,
             requester_id=0x0100,
             tag=(attr << 2) | at,  # Encode attr/at in tag for verification
             attr=attr,
             at=at,
         )
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 50)
-
-    await ClockCycles(dut.sys_clk, 1000)
+        await ClockCycles(sys_clk, 50)
 
     packets = await drain_monitor_packets(usb_bfm)
 
@@ -569,8 +573,12 @@ async def test_tlp_attributes_preserved(dut):
     assert len(packets) == len(attr_tests), f"Should receive {len(attr_tests)}"
 
     # Verify attributes are preserved
+    if dut._log.isEnabledFor(logging.DEBUG):
+        dut._log.debug("\n".join(
+            f"Tag 0x{pkt.tag:02X}: attr={pkt.attr}, at={pkt.at}, "
+            f"expected attr={expected_attr}, at={expected_at}"
+            for pkt, (expected_attr, expected_at) in zip(packets, attr_tests)))
+
     for pkt, (expected_attr, expected_at) in zip(packets, attr_tests):
-        dut._log.info(f"Tag 0x{pkt.tag:02X}: attr={pkt.attr}, at={pkt.at}, "
-                      f"expected attr={expected_attr}, at={expected_at}")
         assert pkt.attr == expected_attr, f"Attr mismatch"
         assert pkt.at == expected_at, f"AT mismatch"
@@ -11,11 +11,6 @@ import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles, Timer
 
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from tbench.common.usb_bfm import USBBFM
 from tbench.common.pcie_bfm import PCIeBFM
 
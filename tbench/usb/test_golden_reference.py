@@ -9,16 +9,14 @@
 #
 
 import cocotb
-from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles
 
-import sys
+import logging
 import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from tbench.common.usb_bfm import USBBFM
 from tbench.common.pcie_bfm import PCIeBFM
+from tbench.common.reset import start_test
 from tbench.common.tlp_builder import TLPBuilder
 
 from bsa_pcie_exerciser.common.protocol import (
@@ -35,40 +33,29 @@ REG_USB_MON_CTRL = 0x080
 REG_USB_MON_RX_CAPTURED = 0x088
 REG_USB_MON_TX_CAPTURED = 0x090
 
+# Incrementing byte pattern, long enough for a 4KB payload at any offset
+_RAMP = bytes(range(256)) * 17
 
-# =============================================================================
-# Test Utilities
-# =============================================================================
-
-async def reset_dut(dut):
-    """Reset and initialize clocks."""
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
-    cocotb.start_soon(Clock(dut.pcie_clk, 8, unit="ns").start())
-    cocotb.start_soon(Clock(dut.usb_clk, 10, unit="ns").start())
-
-    dut.sys_rst.value = 1
-    dut.pcie_rst.value = 1
-    dut.usb_rst.value = 1
-
-    dut.phy_rx_valid.value = 0
-    dut.phy_tx_ready.value = 1
-
-    await ClockCycles(dut.sys_clk, 20)
+# Idle sys_clk cycles between TLPs in the permutation tables. The monitor
+# drops rather than backpressures, so this must cover the USB side draining
+# the largest packet in the tables: a 64-byte write is 27 words at the USB
+# clock, about 34 sys_clk cycles. Override with TLP_GAP to tune.
+_INTER_TLP_GAP = int(os.environ.get('TLP_GAP', '40'))
 
-    dut.sys_rst.value = 0
-    dut.pcie_rst.value = 0
-    dut.usb_rst.value = 0
+# Single-DW write data shared by every byte enable permutation
+_BE_PAYLOAD = b'\xAA\xBB\xCC\xDD'
 
-    await ClockCycles(dut.sys_clk, 50)
 
+# =============================================================================
+# Test Utilities
+# =============================================================================
 
 async def enable_monitoring(usb_bfm: USBBFM, rx=True, tx=True):
     """Enable RX and/or TX monitoring with stats clear."""
+    # Bit 2 (clear) auto-clears in hardware and leaves the enable bits set,
+    # so there is no need for a second write to drop it
     ctrl = (0x01 if rx else 0) | (0x02 if tx else 0) | 0x04  # + clear bit
     await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, ctrl)
-    await ClockCycles(usb_bfm.clk, 5)
-    ctrl = (0x01 if rx else 0) | (0x02 if tx else 0)
-    await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, ctrl)
 
 
 async def receive_and_parse(usb_bfm: USBBFM, timeout=500) -> TLPPacket:
@@ -79,6 +66,44 @@ async def receive_and_parse(usb_bfm: USBBFM, timeout=500) -> TLPPacket:
     return parse_tlp_packet(data)
 
 
+async def inject_and_capture(usb_bfm: USBBFM, pcie_bfm: PCIeBFM, tlps,
+                             inter_tlp_gap=_INTER_TLP_GAP, timeout_cycles=500) -> list:
+    """
+    Inject a whole table of TLPs, then drain the monitor packets.
+
+    Injection runs as one tight loop with only inter_tlp_gap idle cycles
+    between TLPs, so there is no per-TLP round trip through the USB side.
+    The USB BFM's background capture task buffers packets as the monitor
+    streams them out, so they are simply collected once injection is done.
+
+    Args:
+        tlps: List of (beats, bar_hit) tuples
+        inter_tlp_gap: Idle cycles between consecutive TLPs
+        timeout_cycles: Longest wait for each monitor packet
+
+    Returns:
+        Parsed packets in injection order, with None for any not received
+    """
+    for i, (beats, bar_hit) in enumerate(tlps):
+        if i and inter_tlp_gap:
+            await ClockCycles(pcie_bfm.clk, inter_tlp_gap)
+        await pcie_bfm.inject_tlp(beats, bar_hit=bar_hit)
+
+    packets = []
+    for _ in tlps:
+        pkt = await receive_and_parse(usb_bfm, timeout=timeout_cycles)
+        if pkt is None:
+            break
+        packets.append(pkt)
+    return packets + [None] * (len(tlps) - len(packets))
+
+
+def ramp_payload(size: int, offset: int = 0) -> bytes:
+    """Return size bytes counting up from offset, wrapping at 0xFF."""
+    start = offset & 0xFF
+    return _RAMP[start:start + size]
+
+
 def assert_field(name: str, actual, expected, hex_format=False):
     """Assert a field matches with descriptive error message."""
     if hex_format:
@@ -87,6 +112,27 @@ def assert_field(name: str, actual, expected, hex_format=False):
         assert actual == expected, f"{name}: got {actual}, expected {expected}"
 
 
+def assert_fields(dut, results):
+    """
+    Check a batch of field results, reporting every mismatch at once.
+
+    Args:
+        dut: Testbench DUT (for logging)
+        results: Iterable of (name, actual, expected, hex_format) tuples
+    """
+    mismatches = []
+    for name, actual, expected, hex_format in results:
+        if actual != expected:
+            if hex_format:
+                mismatches.append(f"{name}: got 0x{actual:X}, expected 0x{expected:X}")
+            else:
+                mismatches.append(f"{name}: got {actual}, expected {expected}")
+
+    for mismatch in mismatches:
+        dut._log.error(mismatch)
+    assert not mismatches, f"{len(mismatches)} field mismatch(es): " + "; ".join(mismatches)
+
+
 # =============================================================================
 # Golden Reference Test: Memory Read (32-bit address)
 # =============================================================================
@@ -103,9 +149,7 @@ async def test_golden_mrd32_all_fields(dut):
     - we, bar_hit, attr, at
     - timestamp (non-zero)
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut)
 
     await enable_monitoring(usb_bfm, rx=True, tx=False)
 
@@ -133,8 +177,6 @@ async def test_golden_mrd32_all_fields(dut):
     )
     await pcie_bfm.inject_tlp(beats, bar_hit=test_bar_hit)
 
-    await ClockCycles(dut.sys_clk, 100)
-
     pkt = await receive_and_parse(usb_bfm)
     assert pkt is not None, "No packet received"
 
@@ -192,9 +234,7 @@ async def test_golden_mwr32_all_fields(dut):
     - we=1 for write
     - Payload data integrity
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
 
     await enable_monitoring(usb_bfm, rx=True, tx=False)
 
@@ -221,8 +261,6 @@ async def test_golden_mwr32_all_fields(dut):
     )
     await pcie_bfm.inject_tlp(beats, bar_hit=test_bar_hit)
 
-    await ClockCycles(dut.sys_clk, 100)
-
     pkt = await receive_and_parse(usb_bfm)
     assert pkt is not None, "No packet received"
 
@@ -255,9 +293,9 @@ async def test_golden_mwr32_all_fields(dut):
 
     # Verify payload if present
     if pkt.payload and len(pkt.payload) > 0:
-        captured_bytes = pkt.payload_bytes
-        dut._log.info(f"Payload: sent {test_payload.hex()}, captured {captured_bytes[:len(test_payload)].hex()}")
-        assert captured_bytes[:len(test_payload)] == test_payload, "Payload mismatch"
+        captured = memoryview(pkt.payload_bytes)[:len(test_payload)]
+        dut._log.info(f"Payload: sent {test_payload.hex()}, captured {captured.hex()}")
+        assert captured == test_payload, "Payload mismatch"
         dut._log.info("✓ Payload verified")
 
     dut._log.info("✓ All MWr32 fields verified correctly")
@@ -278,9 +316,7 @@ async def test_golden_completion_tx(dut):
     This tests the TX monitor path and completion-specific fields:
     - status, cmp_id, byte_count
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
 
     # Enable TX monitoring to capture outbound completions
     await enable_monitoring(usb_bfm, rx=False, tx=True)
@@ -297,8 +333,6 @@ async def test_golden_completion_tx(dut):
     )
     await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
 
-    await ClockCycles(dut.sys_clk, 150)
-
     pkt = await receive_and_parse(usb_bfm)
     assert pkt is not None, "No completion packet received"
 
@@ -328,23 +362,16 @@ async def test_golden_completion_tx(dut):
 
 
 # =============================================================================
-# Golden Reference Test: Attribute Permutations
+# Golden Reference Check: Attribute Permutations
 # =============================================================================
 
-@cocotb.test()
-async def test_golden_attribute_permutations(dut):
+async def _check_attribute_permutations(dut, usb_bfm: USBBFM, pcie_bfm: PCIeBFM):
     """
     Test all attribute (attr) and address type (at) permutations.
 
     attr[1:0]: [1]=Relaxed Ordering, [0]=No Snoop
     at[1:0]: Address Type (00=Untranslated, 01=Translation Request, 10=Translated)
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
-
-    await enable_monitoring(usb_bfm, rx=True, tx=False)
-
     dut._log.info("=== Attribute Permutations Test ===")
 
     # Test all combinations of attr (0-3) and at (0-2)
@@ -359,8 +386,9 @@ async def test_golden_attribute_permutations(dut):
         (0b11, 0b10, "attr=11, at=10"),
     ]
 
+    tlps = []
     for i, (test_attr, test_at, desc) in enumerate(permutations):
-        beats = TLPBuilder.memory_read_32(
+        beats = TLPBuilder.memory_read_32_cached(
             address=0x100 + i * 4,
             length_dw=1,
             requester_id=0x0100,
@@ -368,37 +396,35 @@ async def test_golden_attribute_permutations(dut):
             attr=test_attr,
             at=test_at,
         )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 80)
+        tlps.append((beats, 0b000001))
+
+    packets = await inject_and_capture(usb_bfm, pcie_bfm, tlps)
 
-        pkt = await receive_and_parse(usb_bfm)
+    debug = dut._log.isEnabledFor(logging.DEBUG)
+    results = []
+    for pkt, (test_attr, test_at, desc) in zip(packets, permutations):
         assert pkt is not None, f"No packet for {desc}"
 
-        assert_field(f"attr ({desc})", pkt.attr, test_attr)
-        assert_field(f"at ({desc})", pkt.at, test_at)
+        results.append((f"attr ({desc})", pkt.attr, test_attr, False))
+        results.append((f"at ({desc})", pkt.at, test_at, False))
 
-        dut._log.info(f"✓ {desc}")
+        if debug:
+            dut._log.debug(f"{desc}: captured attr={pkt.attr:02b}, at={pkt.at:02b}")
 
+    assert_fields(dut, results)
     dut._log.info(f"✓ All {len(permutations)} attribute permutations verified")
 
 
 # =============================================================================
-# Golden Reference Test: Byte Enable Permutations
+# Golden Reference Check: Byte Enable Permutations
 # =============================================================================
 
-@cocotb.test()
-async def test_golden_byte_enable_permutations(dut):
+async def _check_byte_enable_permutations(dut, usb_bfm: USBBFM, pcie_bfm: PCIeBFM):
     """
     Test various first_be and last_be combinations.
 
     Critical for BSA byte-enable compliance testing.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
-
-    await enable_monitoring(usb_bfm, rx=True, tx=False)
-
     dut._log.info("=== Byte Enable Permutations Test ===")
 
     # Test various byte enable patterns
@@ -416,44 +442,43 @@ async def test_golden_byte_enable_permutations(dut):
         (0b1001, 0b0000, "bytes 0,3 (sparse)"),
     ]
 
+    tlps = []
     for i, (test_first_be, test_last_be, desc) in enumerate(permutations):
         beats = TLPBuilder.memory_write_32(
             address=0x200 + i * 4,
-            data_bytes=bytes([0xAA, 0xBB, 0xCC, 0xDD]),
+            data_bytes=_BE_PAYLOAD,
             requester_id=0x0100,
             tag=0x80 + i,
             first_be=test_first_be,
             last_be=test_last_be,
         )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 80)
+        tlps.append((beats, 0b000001))
+
+    packets = await inject_and_capture(usb_bfm, pcie_bfm, tlps)
 
-        pkt = await receive_and_parse(usb_bfm)
+    debug = dut._log.isEnabledFor(logging.DEBUG)
+    results = []
+    for pkt, (test_first_be, test_last_be, desc) in zip(packets, permutations):
         assert pkt is not None, f"No packet for {desc}"
 
-        assert_field(f"first_be ({desc})", pkt.first_be, test_first_be)
-        assert_field(f"last_be ({desc})", pkt.last_be, test_last_be)
+        results.append((f"first_be ({desc})", pkt.first_be, test_first_be, False))
+        results.append((f"last_be ({desc})", pkt.last_be, test_last_be, False))
 
-        dut._log.info(f"✓ first_be=0b{test_first_be:04b}, last_be=0b{test_last_be:04b} - {desc}")
+        if debug:
+            dut._log.debug(f"{desc}: captured first_be=0b{pkt.first_be:04b}, last_be=0b{pkt.last_be:04b}")
 
+    assert_fields(dut, results)
     dut._log.info(f"✓ All {len(permutations)} byte enable permutations verified")
 
 
 # =============================================================================
-# Golden Reference Test: BAR Hit Permutations
+# Golden Reference Check: BAR Hit Permutations
 # =============================================================================
 
-@cocotb.test()
-async def test_golden_bar_hit_permutations(dut):
+async def _check_bar_hit_permutations(dut, usb_bfm: USBBFM, pcie_bfm: PCIeBFM):
     """
     Test all BAR hit values (BAR0-BAR5).
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
-
-    await enable_monitoring(usb_bfm, rx=True, tx=False)
-
     dut._log.info("=== BAR Hit Permutations Test ===")
 
     # bar_hit is captured as 3 bits: BAR0=0b001=1, BAR1=0b010=2, BAR2=0b100=4
@@ -463,49 +488,51 @@ async def test_golden_bar_hit_permutations(dut):
         (0b000100, 4, "BAR2"),
     ]
 
+    tlps = []
     for i, (inject_bar, expected_bar, desc) in enumerate(bar_hits):
-        beats = TLPBuilder.memory_read_32(
+        beats = TLPBuilder.memory_read_32_cached(
             address=0x100,
             length_dw=1,
             requester_id=0x0100,
             tag=0x60 + i,
         )
-        await pcie_bfm.inject_tlp(beats, bar_hit=inject_bar)
-        await ClockCycles(dut.sys_clk, 80)
+        tlps.append((beats, inject_bar))
+
+    packets = await inject_and_capture(usb_bfm, pcie_bfm, tlps)
 
-        pkt = await receive_and_parse(usb_bfm)
+    debug = dut._log.isEnabledFor(logging.DEBUG)
+    results = []
+    for pkt, (inject_bar, expected_bar, desc) in zip(packets, bar_hits):
         assert pkt is not None, f"No packet for {desc}"
 
-        assert_field(f"bar_hit ({desc})", pkt.bar_hit, expected_bar)
+        results.append((f"bar_hit ({desc})", pkt.bar_hit, expected_bar, False))
 
-        dut._log.info(f"✓ {desc} (bar_hit={pkt.bar_hit})")
+        if debug:
+            dut._log.debug(f"{desc}: captured bar_hit={pkt.bar_hit}")
 
+    assert_fields(dut, results)
     dut._log.info(f"✓ All BAR hit permutations verified")
 
 
 # =============================================================================
-# Golden Reference Test: Payload Size Variations
+# Golden Reference Check: Payload Size Variations
 # =============================================================================
 
-@cocotb.test()
-async def test_golden_payload_sizes(dut):
+async def _check_payload_sizes(dut, usb_bfm: USBBFM, pcie_bfm: PCIeBFM):
     """
     Test various payload sizes to verify payload capture integrity.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
-
-    await enable_monitoring(usb_bfm, rx=True, tx=False)
-
     dut._log.info("=== Payload Size Variations Test ===")
 
     # Test sizes: 4, 8, 16, 32, 64 bytes
     sizes = [4, 8, 16, 32, 64]
 
+    payloads = []
+    tlps = []
     for size in sizes:
         # Create distinctive payload pattern
-        test_payload = bytes([(i + size) & 0xFF for i in range(size)])
+        test_payload = ramp_payload(size, offset=size)
+        payloads.append(test_payload)
 
         beats = TLPBuilder.memory_write_32(
             address=0x300,
@@ -513,43 +540,40 @@ async def test_golden_payload_sizes(dut):
             requester_id=0x0100,
             tag=size,
         )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 100 + size)
+        tlps.append((beats, 0b000001))
+
+    packets = await inject_and_capture(usb_bfm, pcie_bfm, tlps)
 
-        pkt = await receive_and_parse(usb_bfm)
+    debug = dut._log.isEnabledFor(logging.DEBUG)
+    for pkt, size, test_payload in zip(packets, sizes, payloads):
         assert pkt is not None, f"No packet for {size}-byte payload"
 
         # Verify payload
         assert pkt.payload is not None and len(pkt.payload) > 0, \
             f"Expected payload for {size}-byte write"
 
-        captured = pkt.payload_bytes[:size]
+        # Compare through a memoryview so the slice doesn't copy
+        captured = memoryview(pkt.payload_bytes)[:size]
         match = captured == test_payload
         if not match:
             dut._log.error(f"Payload mismatch at {size} bytes:")
             dut._log.error(f"  Expected: {test_payload.hex()}")
             dut._log.error(f"  Got:      {captured.hex()}")
         assert match, f"Payload mismatch for {size}-byte write"
-        dut._log.info(f"✓ {size}-byte payload verified")
+        if debug:
+            dut._log.debug(f"✓ {size}-byte payload verified")
 
     dut._log.info(f"✓ All payload sizes verified")
 
 
 # =============================================================================
-# Golden Reference Test: Requester ID Variations
+# Golden Reference Check: Requester ID Variations
 # =============================================================================
 
-@cocotb.test()
-async def test_golden_requester_id_variations(dut):
+async def _check_requester_id_variations(dut, usb_bfm: USBBFM, pcie_bfm: PCIeBFM):
     """
     Test various requester ID values to ensure full 16-bit capture.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
-
-    await enable_monitoring(usb_bfm, rx=True, tx=False)
-
     dut._log.info("=== Requester ID Variations Test ===")
 
     # Test various requester IDs including edge cases
@@ -563,61 +587,159 @@ async def test_golden_requester_id_variations(dut):
         0xA5A5,  # Alternating pattern (inverted)
     ]
 
+    tlps = []
     for i, req_id in enumerate(req_ids):
-        beats = TLPBuilder.memory_read_32(
+        beats = TLPBuilder.memory_read_32_cached(
             address=0x100,
             length_dw=1,
             requester_id=req_id,
             tag=i,
         )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 80)
+        tlps.append((beats, 0b000001))
 
-        pkt = await receive_and_parse(usb_bfm)
+    packets = await inject_and_capture(usb_bfm, pcie_bfm, tlps)
+
+    debug = dut._log.isEnabledFor(logging.DEBUG)
+    results = []
+    for pkt, req_id in zip(packets, req_ids):
         assert pkt is not None, f"No packet for req_id=0x{req_id:04X}"
 
-        assert_field(f"req_id (0x{req_id:04X})", pkt.req_id, req_id, hex_format=True)
+        results.append((f"req_id (0x{req_id:04X})", pkt.req_id, req_id, True))
 
-        dut._log.info(f"✓ req_id=0x{req_id:04X}")
+        if debug:
+            dut._log.debug(f"req_id=0x{req_id:04X}: captured 0x{pkt.req_id:04X}")
 
+    assert_fields(dut, results)
     dut._log.info(f"✓ All requester ID variations verified")
 
 
 # =============================================================================
-# Golden Reference Test: Tag Variations
+# Golden Reference Check: Tag Variations
 # =============================================================================
 
-@cocotb.test()
-async def test_golden_tag_variations(dut):
+async def _check_tag_variations(dut, usb_bfm: USBBFM, pcie_bfm: PCIeBFM):
     """
     Test various tag values to ensure full 8-bit capture.
     """
-    await reset_dut(dut)
-    usb_bfm = USBBFM(dut)
-    pcie_bfm = PCIeBFM(dut)
-
-    await enable_monitoring(usb_bfm, rx=True, tx=False)
-
     dut._log.info("=== Tag Variations Test ===")
 
     # Test various tags including edge cases
     tags = [0x00, 0x01, 0x7F, 0x80, 0xFE, 0xFF, 0x55, 0xAA, 0x42]
 
+    tlps = []
     for i, tag in enumerate(tags):
-        beats = TLPBuilder.memory_read_32(
+        beats = TLPBuilder.memory_read_32_cached(
             address=0x100 + i * 4,
             length_dw=1,
             requester_id=0x0100,
             tag=tag,
         )
-        await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
-        await ClockCycles(dut.sys_clk, 80)
+        tlps.append((beats, 0b000001))
 
-        pkt = await receive_and_parse(usb_bfm)
+    packets = await inject_and_capture(usb_bfm, pcie_bfm, tlps)
+
+    debug = dut._log.isEnabledFor(logging.DEBUG)
+    results = []
+    for pkt, tag in zip(packets, tags):
         assert pkt is not None, f"No packet for tag=0x{tag:02X}"
 
-        assert_field(f"tag (0x{tag:02X})", pkt.tag, tag, hex_format=True)
+        results.append((f"tag (0x{tag:02X})", pkt.tag, tag, True))
 
-        dut._log.info(f"✓ tag=0x{tag:02X}")
+        if debug:
+            dut._log.debug(f"tag=0x{tag:02X}: captured 0x{pkt.tag:02X}")
 
+    assert_fields(dut, results)
     dut._log.info(f"✓ All tag variations verified")
+
+
+# =============================================================================
+# Golden Reference Permutation Tests
+# =============================================================================
+#
+# The permutation tables above are short, so by default they share a single
+# reset and monitor enable in test_golden_permutations. Set GOLDEN_SPLIT=1
+# to run each table as its own test instead, e.g. to shard or select them
+# individually with TESTCASE; the Makefile sets it when one is selected.
+
+GOLDEN_SPLIT = os.environ.get('GOLDEN_SPLIT', '0') == '1'
+
+_PERMUTATION_CHECKS = (
+    _check_attribute_permutations,
+    _check_byte_enable_permutations,
+    _check_bar_hit_permutations,
+    _check_payload_sizes,
+    _check_requester_id_variations,
+    _check_tag_variations,
+)
+
+
+async def start_permutation_test(dut):
+    """Reset the DUT, build the BFMs and enable RX monitoring."""
+    usb_bfm, pcie_bfm = await start_test(dut, mode="soft")
+
+    await enable_monitoring(usb_bfm, rx=True, tx=False)
+
+    return usb_bfm, pcie_bfm
+
+
+@cocotb.test(skip=GOLDEN_SPLIT)
+async def test_golden_permutations(dut):
+    """
+    Run every golden permutation table after a single reset.
+    """
+    usb_bfm, pcie_bfm = await start_permutation_test(dut)
+
+    for check in _PERMUTATION_CHECKS:
+        await check(dut, usb_bfm, pcie_bfm)
+
+
+# The per-table tests only exist when split, so selecting one by name
+# without GOLDEN_SPLIT=1 fails to match instead of silently skipping
+if GOLDEN_SPLIT:
+    @cocotb.test()
+    async def test_golden_attribute_permutations(dut):
+        """
+        Test all attribute (attr) and address type (at) permutations.
+        """
+        usb_bfm, pcie_bfm = await start_permutation_test(dut)
+        await _check_attribute_permutations(dut, usb_bfm, pcie_bfm)
+
+    @cocotb.test()
+    async def test_golden_byte_enable_permutations(dut):
+        """
+        Test various first_be and last_be combinations.
+        """
+        usb_bfm, pcie_bfm = await start_permutation_test(dut)
+        await _check_byte_enable_permutations(dut, usb_bfm, pcie_bfm)
+
+    @cocotb.test()
+    async def test_golden_bar_hit_permutations(dut):
+        """
+        Test all BAR hit values (BAR0-BAR5).
+        """
+        usb_bfm, pcie_bfm = await start_permutation_test(dut)
+        await _check_bar_hit_permutations(dut, usb_bfm, pcie_bfm)
+
+    @cocotb.test()
+    async def test_golden_payload_sizes(dut):
+        """
+        Test various payload sizes to verify payload capture integrity.
+        """
+        usb_bfm, pcie_bfm = await start_permutation_test(dut)
+        await _check_payload_sizes(dut, usb_bfm, pcie_bfm)
+
+    @cocotb.test()
+    async def test_golden_requester_id_variations(dut):
+        """
+        Test various requester ID values to ensure full 16-bit capture.
+        """
+        usb_bfm, pcie_bfm = await start_permutation_test(dut)
+        await _check_requester_id_variations(dut, usb_bfm, pcie_bfm)
+
+    @cocotb.test()
+    async def test_golden_tag_variations(dut):
+        """
+        Test various tag values to ensure full 8-bit capture.
+        """
+        usb_bfm, pcie_bfm = await start_permutation_test(dut)
+        await _check_tag_variations(dut, usb_bfm, pcie_bfm)
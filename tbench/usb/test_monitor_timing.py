@@ -13,11 +13,6 @@ import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles, RisingEdge
 
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from tbench.common.usb_bfm import USBBFM
 from tbench.common.pcie_bfm import PCIeBFM
 from tbench.common.tlp_builder import TLPBuilder
@@ -35,6 +30,9 @@ from bsa_pcie_exerciser.common.protocol import (
 REG_USB_MON_CTRL        = 0x080
 REG_USB_MON_RX_CAPTURED = 0x088
 
+# Distinctive all-0xAA payload for the pipeline flush test
+_PATTERN_AA8 = b'\xAA' * 8
+
 
 # =============================================================================
 # Test Utilities
@@ -286,7 +284,7 @@ async def test_monitor_pipeline_flush(dut):
     # First TLP with distinctive pattern
     tlp1 = TLPBuilder.memory_write_32(
         address=0xAAAA0000,
-        data_bytes=bytes([0xAA] * 8),
+        data_bytes=_PATTERN_AA8,
         requester_id=0xAAAA,
         tag=0xAA,
     )
@@ -448,16 +446,19 @@ async def test_monitor_address_field_alignment(dut):
         0x00000ABC,  # Arbitrary offset
     ]
 
-    for addr in test_addresses:
-        # BAR offset (lower 12 bits), DWORD-aligned
-        expected_offset = addr & 0xFFC
-
-        beats = TLPBuilder.memory_read_32(
+    # (address, expected BAR offset, beats), built before any injection.
+    # The BAR offset is the lower 12 bits, DWORD-aligned.
+    cases = [
+        (addr, addr & 0xFFC, TLPBuilder.memory_read_32(
             address=addr,
             length_dw=1,
             requester_id=0x0100,
             tag=0x01,
-        )
+        ))
+        for addr in test_addresses
+    ]
+
+    for addr, expected_offset, beats in cases:
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
 
         await ClockCycles(dut.sys_clk, 100)
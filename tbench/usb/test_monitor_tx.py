@@ -12,10 +12,7 @@ import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles
 
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import struct
 
 from tbench.common.usb_bfm import USBBFM
 from tbench.common.pcie_bfm import PCIeBFM
@@ -51,9 +48,9 @@ REG_USB_MON_TX_DROPPED  = 0x094
 
 async def reset_dut(dut):
     """Reset and initialize clocks."""
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
-    cocotb.start_soon(Clock(dut.pcie_clk, 8, unit="ns").start())
-    cocotb.start_soon(Clock(dut.usb_clk, 10, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns", impl="gpi").start())
+    cocotb.start_soon(Clock(dut.pcie_clk, 8, unit="ns", impl="gpi").start())
+    cocotb.start_soon(Clock(dut.usb_clk, 10, unit="ns", impl="gpi").start())
 
     dut.sys_rst.value = 1
     dut.pcie_rst.value = 1
@@ -126,7 +123,7 @@ async def test_tx_monitor_completion(dut):
     assert packet_data is not None, "Expected to capture TX completion TLP"
 
     pkt = parse_monitor_packet(packet_data)
-    dut._log.info(f"Captured TX TLP: type={pkt.type_name}, dir={pkt.direction}")
+    dut._log.info("Captured TX TLP: type=%s, dir=%s", pkt.type_name, pkt.direction)
     # Completion should be TX direction
     assert pkt.direction == Direction.TX, "Expected TX direction"
     assert pkt.tlp_type in (TLP_TYPE_CPL, TLP_TYPE_CPLD), \
@@ -152,10 +149,12 @@ async def test_tx_monitor_dma_read(dut):
     dma_addr = 0x12345000
     dma_len = 64  # bytes
 
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_LO, dma_addr & 0xFFFFFFFF)
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_HI, (dma_addr >> 32) & 0xFFFFFFFF)
-    await usb_bfm.send_etherbone_write(REG_DMA_LEN, dma_len)
-    await usb_bfm.send_etherbone_write(REG_DMA_OFFSET, 0)
+    await usb_bfm.send_etherbone_write_burst([
+        (REG_DMA_OFFSET, 0),
+        (REG_DMA_BUS_ADDR_LO, dma_addr & 0xFFFFFFFF),
+        (REG_DMA_BUS_ADDR_HI, (dma_addr >> 32) & 0xFFFFFFFF),
+        (REG_DMA_LEN, dma_len),
+    ])
 
     # Trigger DMA read (direction=0)
     await usb_bfm.send_etherbone_write(REG_DMACTL, 0x01)  # trigger=1, dir=0 (read)
@@ -169,10 +168,10 @@ async def test_tx_monitor_dma_read(dut):
     assert packet_data is not None, "Expected to capture DMA read TLP"
 
     pkt = parse_monitor_packet(packet_data)
-    dut._log.info(f"Captured DMA TLP: type={pkt.type_name}, addr=0x{pkt.address:X}")
+    dut._log.info("Captured DMA TLP: type=%s, addr=0x%X", pkt.type_name, pkt.address)
     assert pkt.direction == Direction.TX, "Expected TX direction"
     assert pkt.tlp_type == TLP_TYPE_MRD, f"Expected MRd TLP, got {pkt.type_name}"
-    dut._log.info(f"DMA read request captured: addr=0x{pkt.address:016X}")
+    dut._log.info("DMA read request captured: addr=0x%016X", pkt.address)
 
 
 # MSI-X Table entry offsets (relative to BAR2)
@@ -183,6 +182,9 @@ MSIX_ADDR_HI_OFFSET = 4
 MSIX_DATA_OFFSET = 8
 MSIX_VECTOR_CTRL_OFFSET = 12
 
+# Whole table entry as four little-endian DWORDs, compiled once
+_MSIX_ENTRY = struct.Struct('<4I')
+
 
 async def configure_msix_entry(pcie_bfm, entry: int, address: int, data: int, masked: bool = False):
     """
@@ -197,43 +199,19 @@ async def configure_msix_entry(pcie_bfm, entry: int, address: int, data: int, ma
     """
     base_offset = entry * MSIX_ENTRY_SIZE
 
-    # Write addr_lo
+    # One 4-DWORD write covers the whole entry: addr_lo, addr_hi, data and
+    # vector control (bit 0 = mask). The table handles multi-beat writes.
+    ctrl = 1 if masked else 0
+    entry_bytes = _MSIX_ENTRY.pack(
+        address & 0xFFFFFFFF, (address >> 32) & 0xFFFFFFFF, data, ctrl)
     beats = TLPBuilder.memory_write_32(
         address=base_offset + MSIX_ADDR_LO_OFFSET,
-        data_bytes=(address & 0xFFFFFFFF).to_bytes(4, 'little'),
+        data_bytes=entry_bytes,
         requester_id=0x0100,
         tag=0,
     )
     await pcie_bfm.inject_tlp(beats, bar_hit=0b000100)  # BAR2
 
-    # Write addr_hi
-    beats = TLPBuilder.memory_write_32(
-        address=base_offset + MSIX_ADDR_HI_OFFSET,
-        data_bytes=((address >> 32) & 0xFFFFFFFF).to_bytes(4, 'little'),
-        requester_id=0x0100,
-        tag=0,
-    )
-    await pcie_bfm.inject_tlp(beats, bar_hit=0b000100)
-
-    # Write data
-    beats = TLPBuilder.memory_write_32(
-        address=base_offset + MSIX_DATA_OFFSET,
-        data_bytes=data.to_bytes(4, 'little'),
-        requester_id=0x0100,
-        tag=0,
-    )
-    await pcie_bfm.inject_tlp(beats, bar_hit=0b000100)
-
-    # Write vector control (bit 0 = mask)
-    ctrl = 1 if masked else 0
-    beats = TLPBuilder.memory_write_32(
-        address=base_offset + MSIX_VECTOR_CTRL_OFFSET,
-        data_bytes=ctrl.to_bytes(4, 'little'),
-        requester_id=0x0100,
-        tag=0,
-    )
-    await pcie_bfm.inject_tlp(beats, bar_hit=0b000100)
-
 
 @cocotb.test()
 async def test_tx_monitor_msix_write(dut):
@@ -268,10 +246,10 @@ async def test_tx_monitor_msix_write(dut):
     assert packet_data is not None, "Expected to capture MSI-X TLP"
 
     pkt = parse_monitor_packet(packet_data)
-    dut._log.info(f"Captured TLP: type={pkt.type_name}, addr=0x{pkt.address:X}")
+    dut._log.info("Captured TLP: type=%s, addr=0x%X", pkt.type_name, pkt.address)
     assert pkt.direction == Direction.TX, "Expected TX direction"
     assert pkt.tlp_type == TLP_TYPE_MWR, f"Expected MWr TLP for MSI-X, got {pkt.type_name}"
-    dut._log.info(f"MSI-X write captured: addr=0x{pkt.address:016X}")
+    dut._log.info("MSI-X write captured: addr=0x%016X", pkt.address)
 
 
 @cocotb.test()
@@ -288,9 +266,11 @@ async def test_tx_monitor_dma_with_no_snoop(dut):
     dma_addr = 0x1000
     dma_len = 32
 
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_LO, dma_addr)
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_HI, 0)
-    await usb_bfm.send_etherbone_write(REG_DMA_LEN, dma_len)
+    await usb_bfm.send_etherbone_write_burst([
+        (REG_DMA_BUS_ADDR_LO, dma_addr),
+        (REG_DMA_BUS_ADDR_HI, 0),
+        (REG_DMA_LEN, dma_len),
+    ])
 
     # DMACTL: trigger=1, dir=0 (read), no_snoop=1 (bit 5)
     await usb_bfm.send_etherbone_write(REG_DMACTL, 0x21)  # no_snoop + trigger
@@ -307,7 +287,7 @@ async def test_tx_monitor_dma_with_no_snoop(dut):
 
     # Check No-Snoop bit in attr (bit 0)
     ns_bit = pkt.attr & 1
-    dut._log.info(f"No-Snoop bit in captured TLP: {ns_bit}")
+    dut._log.info("No-Snoop bit in captured TLP: %s", ns_bit)
     assert ns_bit == 1, "Expected No-Snoop bit to be set"
 
 
@@ -327,9 +307,11 @@ async def test_tx_monitor_pasid_prefix(dut):
 
     # Configure DMA with PASID enabled
     dma_addr = 0x2000
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_LO, dma_addr)
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_HI, 0)
-    await usb_bfm.send_etherbone_write(REG_DMA_LEN, 32)
+    await usb_bfm.send_etherbone_write_burst([
+        (REG_DMA_BUS_ADDR_LO, dma_addr),
+        (REG_DMA_BUS_ADDR_HI, 0),
+        (REG_DMA_LEN, 32),
+    ])
 
     # DMACTL: trigger=1, pasid_en=1 (bit 6)
     await usb_bfm.send_etherbone_write(REG_DMACTL, 0x41)  # pasid_en + trigger
@@ -341,11 +323,11 @@ async def test_tx_monitor_pasid_prefix(dut):
     assert packet_data is not None, "Expected to capture DMA TLP with PASID"
 
     pkt = parse_monitor_packet(packet_data)
-    dut._log.info(f"Captured TLP: type={pkt.type_name}, pasid_valid={pkt.pasid_valid}")
+    dut._log.info("Captured TLP: type=%s, pasid_valid=%s", pkt.type_name, pkt.pasid_valid)
     assert pkt.pasid_valid, "Expected PASID prefix in captured TLP"
     assert pkt.pasid == pasid_value, \
         f"Expected PASID 0x{pasid_value:05X}, got 0x{pkt.pasid:05X}"
-    dut._log.info(f"PASID captured: 0x{pkt.pasid:05X}")
+    dut._log.info("PASID captured: 0x%05X", pkt.pasid)
 
 
 @cocotb.test()
@@ -363,7 +345,7 @@ async def test_tx_monitor_captured_count(dut):
     await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, 0x02)  # TX enable only
 
     initial_count = await usb_bfm.send_etherbone_read(REG_USB_MON_TX_CAPTURED)
-    dut._log.info(f"Initial TX captured count: {initial_count}")
+    dut._log.info("Initial TX captured count: %d", initial_count)
 
     # The count will only increment when TX TLPs are generated by the SoC
     # This depends on triggering DMA, MSI-X, or responding to reads
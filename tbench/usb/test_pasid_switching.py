@@ -12,12 +12,7 @@
 
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import ClockCycles
-
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from cocotb.triggers import ClockCycles, FallingEdge, First
 
 from tbench.common.usb_bfm import USBBFM
 from tbench.common.pcie_bfm import PCIeBFM
@@ -59,6 +54,21 @@ ATSCTL_SUCCESS      = (1 << 7)
 # DMASTATUS bit definitions
 DMASTATUS_BUSY = (1 << 0)
 
+# Fixed (address, value) register writes, indexed by privileged where the
+# value depends on it
+_EB_ENABLE_TX = (REG_USB_MON_CTRL, 0x02)
+_EB_TRIG_DMA_RD_PASID = (
+    (REG_DMACTL, DMACTL_TRIGGER | DMACTL_PASID_EN),
+    (REG_DMACTL, DMACTL_TRIGGER | DMACTL_PASID_EN | DMACTL_PRIVILEGED),
+)
+_EB_TRIG_DMA_WR_PASID = (
+    (REG_DMACTL, DMACTL_TRIGGER | DMACTL_DIRECTION | DMACTL_PASID_EN),
+    (REG_DMACTL, DMACTL_TRIGGER | DMACTL_DIRECTION | DMACTL_PASID_EN | DMACTL_PRIVILEGED),
+)
+
+# Completion data returned for every PASID context's DMA read
+_CPL_PAYLOAD_55x8 = b'\x55' * 8
+
 
 # =============================================================================
 # Test Utilities
@@ -66,9 +76,9 @@ DMASTATUS_BUSY = (1 << 0)
 
 async def reset_dut(dut):
     """Reset and initialize clocks."""
-    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns").start())
-    cocotb.start_soon(Clock(dut.pcie_clk, 8, unit="ns").start())
-    cocotb.start_soon(Clock(dut.usb_clk, 10, unit="ns").start())
+    cocotb.start_soon(Clock(dut.sys_clk, 8, unit="ns", impl="gpi").start())
+    cocotb.start_soon(Clock(dut.pcie_clk, 8, unit="ns", impl="gpi").start())
+    cocotb.start_soon(Clock(dut.usb_clk, 10, unit="ns", impl="gpi").start())
 
     dut.sys_rst.value = 1
     dut.pcie_rst.value = 1
@@ -88,43 +98,46 @@ async def reset_dut(dut):
 
 async def enable_tx_monitoring(usb_bfm: USBBFM):
     """Enable TX monitoring."""
-    await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, 0x02)
+    await usb_bfm.send_etherbone_write(*_EB_ENABLE_TX)
 
 
 async def configure_dma_with_pasid(usb_bfm: USBBFM, address: int, length: int,
                                     pasid: int, privileged: bool = False):
     """Configure DMA with PASID enabled."""
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_LO, address & 0xFFFFFFFF)
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_HI, (address >> 32) & 0xFFFFFFFF)
-    await usb_bfm.send_etherbone_write(REG_DMA_LEN, length)
-    await usb_bfm.send_etherbone_write(REG_DMA_OFFSET, 0)
-    await usb_bfm.send_etherbone_write(REG_PASID_VAL, pasid)
+    # OFFSET..LEN are contiguous and go out as one Etherbone record;
+    # PASID_VAL sits past DMASTATUS and needs a record of its own.
+    # These are plain storage registers, so values already written
+    # by an earlier call on this BFM are not sent again.
+    await usb_bfm.send_etherbone_write_changed([
+        (REG_DMA_OFFSET, 0),
+        (REG_DMA_BUS_ADDR_LO, address & 0xFFFFFFFF),
+        (REG_DMA_BUS_ADDR_HI, (address >> 32) & 0xFFFFFFFF),
+        (REG_DMA_LEN, length),
+        (REG_PASID_VAL, pasid),
+    ])
 
 
 async def trigger_dma_read_with_pasid(usb_bfm: USBBFM, privileged: bool = False):
     """Trigger DMA read with PASID enabled."""
-    ctl = DMACTL_TRIGGER | DMACTL_PASID_EN
-    if privileged:
-        ctl |= DMACTL_PRIVILEGED
-    await usb_bfm.send_etherbone_write(REG_DMACTL, ctl)
+    await usb_bfm.send_etherbone_write(*_EB_TRIG_DMA_RD_PASID[privileged])
 
 
 async def trigger_dma_write_with_pasid(usb_bfm: USBBFM, privileged: bool = False):
     """Trigger DMA write with PASID enabled."""
-    ctl = DMACTL_TRIGGER | DMACTL_DIRECTION | DMACTL_PASID_EN
-    if privileged:
-        ctl |= DMACTL_PRIVILEGED
-    await usb_bfm.send_etherbone_write(REG_DMACTL, ctl)
+    await usb_bfm.send_etherbone_write(*_EB_TRIG_DMA_WR_PASID[privileged])
 
 
 async def wait_for_dma_idle(usb_bfm: USBBFM, timeout_cycles: int = 1000):
-    """Wait for DMA engine to become idle."""
-    for _ in range(timeout_cycles // 10):
-        status = await usb_bfm.send_etherbone_read(REG_DMASTATUS)
-        if not (status & DMASTATUS_BUSY):
-            return True
-        await ClockCycles(usb_bfm.dut.sys_clk, 10)
-    return False
+    """
+    Wait for DMA engine to become idle.
+
+    Blocks on the dma_busy observation port exposed by tb_usb rather than
+    polling DMASTATUS over Etherbone.
+    """
+    dut = usb_bfm.dut
+    if dut.dma_busy.value:
+        await First(FallingEdge(dut.dma_busy), ClockCycles(dut.sys_clk, timeout_cycles))
+    return not dut.dma_busy.value
 
 
 def parse_monitor_packet(data: bytes) -> TLPPacket:
@@ -161,7 +174,7 @@ async def test_pasid_value_in_dma_tlp(dut):
     assert packet_data is not None, "Expected to capture DMA TLP with PASID"
 
     pkt = parse_monitor_packet(packet_data)
-    dut._log.info(f"Captured TLP: pasid_valid={pkt.pasid_valid}, pasid=0x{pkt.pasid:05X}")
+    dut._log.info("Captured TLP: pasid_valid=%s, pasid=0x%05X", pkt.pasid_valid, pkt.pasid)
 
     assert pkt.pasid_valid, "Expected PASID prefix in TLP"
     assert pkt.pasid == test_pasid, \
@@ -182,7 +195,7 @@ async def test_pasid_switch_between_dma(dut):
     pasid_values = [0x00001, 0x12345, 0xFFFFF]
 
     for pasid in pasid_values:
-        dut._log.info(f"Testing PASID 0x{pasid:05X}")
+        dut._log.info("Testing PASID 0x%05X", pasid)
 
         await configure_dma_with_pasid(usb_bfm, 0x20000000, 16, pasid)
         await trigger_dma_write_with_pasid(usb_bfm)
@@ -199,7 +212,7 @@ async def test_pasid_switch_between_dma(dut):
         assert pkt.pasid == pasid, \
             f"PASID mismatch: expected 0x{pasid:05X}, got 0x{pkt.pasid:05X}"
 
-        dut._log.info(f"  PASID 0x{pasid:05X} verified")
+        dut._log.info("  PASID 0x%05X verified", pasid)
 
         await wait_for_dma_idle(usb_bfm)
 
@@ -226,7 +239,8 @@ async def test_pasid_privileged_mode(dut):
     assert packet_data is not None, "Expected to capture non-privileged DMA TLP"
 
     pkt = parse_monitor_packet(packet_data)
-    dut._log.info(f"Non-privileged: pasid_valid={pkt.pasid_valid}, pasid=0x{pkt.pasid:05X}, privileged={pkt.privileged}")
+    dut._log.info("Non-privileged: pasid_valid=%s, pasid=0x%05X, privileged=%s",
+                  pkt.pasid_valid, pkt.pasid, pkt.privileged)
     assert pkt.pasid_valid, "Expected PASID prefix for non-privileged mode"
     assert not pkt.privileged, "Expected privileged=False when not set"
 
@@ -242,7 +256,8 @@ async def test_pasid_privileged_mode(dut):
     assert packet_data is not None, "Expected to capture privileged DMA TLP"
 
     pkt = parse_monitor_packet(packet_data)
-    dut._log.info(f"Privileged: pasid_valid={pkt.pasid_valid}, pasid=0x{pkt.pasid:05X}, privileged={pkt.privileged}")
+    dut._log.info("Privileged: pasid_valid=%s, pasid=0x%05X, privileged=%s",
+                  pkt.pasid_valid, pkt.pasid, pkt.privileged)
     assert pkt.pasid_valid, "Expected PASID prefix for privileged mode"
     assert pkt.privileged, "Expected privileged=True when set"
 
@@ -258,10 +273,12 @@ async def test_dma_without_pasid(dut):
     await enable_tx_monitoring(usb_bfm)
 
     # Set PASID value but DON'T enable PASID in DMACTL
-    await usb_bfm.send_etherbone_write(REG_PASID_VAL, 0xABCDE)
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_LO, 0x50000000)
-    await usb_bfm.send_etherbone_write(REG_DMA_BUS_ADDR_HI, 0)
-    await usb_bfm.send_etherbone_write(REG_DMA_LEN, 16)
+    await usb_bfm.send_etherbone_write_burst([
+        (REG_PASID_VAL, 0xABCDE),
+        (REG_DMA_BUS_ADDR_LO, 0x50000000),
+        (REG_DMA_BUS_ADDR_HI, 0),
+        (REG_DMA_LEN, 16),
+    ])
 
     # Trigger WITHOUT PASID_EN
     await usb_bfm.send_etherbone_write(REG_DMACTL, DMACTL_TRIGGER | DMACTL_DIRECTION)
@@ -273,7 +290,7 @@ async def test_dma_without_pasid(dut):
     assert packet_data is not None, "Expected to capture DMA TLP"
 
     pkt = parse_monitor_packet(packet_data)
-    dut._log.info(f"PASID disabled: pasid_valid={pkt.pasid_valid}")
+    dut._log.info("PASID disabled: pasid_valid=%s", pkt.pasid_valid)
     assert not pkt.pasid_valid, "Should NOT have PASID prefix when disabled"
 
 
@@ -298,10 +315,19 @@ async def test_multiple_pasid_contexts(dut):
         {"pasid": 0x0004, "addr": 0x40000000, "name": "Context D"},
     ]
 
-    for ctx in contexts:
-        dut._log.info(f"Testing {ctx['name']}: PASID=0x{ctx['pasid']:05X}")
+    # Every context's DMA read is completed with the same data, so build the
+    # completion once and patch in each request's tag
+    cpl_template = TLPBuilder.make_completion_template(
+        requester_id=0x0100,
+        completer_id=0x0000,
+        data_bytes=_CPL_PAYLOAD_55x8,
+    )
+
+    await configure_dma_with_pasid(usb_bfm, contexts[0]['addr'], 8, contexts[0]['pasid'])
+
+    for i, ctx in enumerate(contexts):
+        dut._log.info("Testing %s: PASID=0x%05X", ctx['name'], ctx['pasid'])
 
-        await configure_dma_with_pasid(usb_bfm, ctx['addr'], 8, ctx['pasid'])
         await trigger_dma_read_with_pasid(usb_bfm)
 
         await ClockCycles(dut.sys_clk, 100)
@@ -317,15 +343,17 @@ async def test_multiple_pasid_contexts(dut):
             f"{ctx['name']}: PASID mismatch"
 
         # Inject completion
-        beats = TLPBuilder.completion(
-            requester_id=0x0100,
-            completer_id=0x0000,
-            tag=pkt.tag,
-            data_bytes=bytes([0x55] * 8),
-        )
+        beats = TLPBuilder.patch_completion(cpl_template, pkt.tag)
         await pcie_bfm.inject_tlp(beats, bar_hit=0)
 
-        await wait_for_dma_idle(usb_bfm)
+        # There is a single DMA engine, so contexts cannot be in flight
+        # together. It latches its parameters at the trigger though, so the
+        # next context is programmed while this DMA finishes.
+        idle_task = cocotb.start_soon(wait_for_dma_idle(usb_bfm))
+        if i + 1 < len(contexts):
+            nxt = contexts[i + 1]
+            await configure_dma_with_pasid(usb_bfm, nxt['addr'], 8, nxt['pasid'])
+        await idle_task
 
     dut._log.info("All PASID contexts verified successfully")
 
@@ -352,7 +380,7 @@ async def test_pasid_max_value(dut):
     assert packet_data is not None, "Expected to capture DMA TLP with max PASID"
 
     pkt = parse_monitor_packet(packet_data)
-    dut._log.info(f"Max PASID test: got 0x{pkt.pasid:05X}")
+    dut._log.info("Max PASID test: got 0x%05X", pkt.pasid)
     assert pkt.pasid_valid, "Expected PASID prefix"
     assert pkt.pasid == max_pasid, \
         f"Expected max PASID 0x{max_pasid:05X}, got 0x{pkt.pasid:05X}"
@@ -378,6 +406,6 @@ async def test_pasid_zero_value(dut):
     assert packet_data is not None, "Expected to capture DMA TLP with zero PASID"
 
     pkt = parse_monitor_packet(packet_data)
-    dut._log.info(f"Zero PASID test: valid={pkt.pasid_valid}, pasid=0x{pkt.pasid:05X}")
+    dut._log.info("Zero PASID test: valid=%s, pasid=0x%05X", pkt.pasid_valid, pkt.pasid)
     assert pkt.pasid_valid, "PASID prefix should be present even for value 0"
     assert pkt.pasid == 0, "PASID should be 0"
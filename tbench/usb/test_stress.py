@@ -16,13 +16,9 @@ import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles, Timer, RisingEdge, Combine, First
 from cocotb.utils import get_sim_time
+import logging
 import random
 
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from tbench.common.usb_bfm import USBBFM
 from tbench.common.pcie_bfm import PCIeBFM
 from tbench.common.tlp_builder import TLPBuilder
@@ -60,6 +56,9 @@ STRESS_PACKET_COUNT = 100
 LONG_STRESS_PACKET_COUNT = 500
 STABILITY_DURATION_CYCLES = 50000
 
+# Incrementing byte pattern; payloads are slices of it at any start offset
+_RAMP = bytes(range(256)) * 2
+
 
 # =============================================================================
 # Test Utilities
@@ -87,32 +86,43 @@ async def reset_dut(dut):
     await ClockCycles(dut.sys_clk, 50)
 
 
+# USB_MON_CTRL values by (rx, tx): (enable only, enable + clear)
+_MON_CTRL = {
+    (True, True):   (0x03, 0x07),
+    (True, False):  (0x01, 0x05),
+    (False, True):  (0x02, 0x06),
+    (False, False): (0x00, 0x04),
+}
+
+
 async def enable_monitoring(usb_bfm: USBBFM, rx=True, tx=True):
     """Enable RX and/or TX monitoring."""
-    ctrl = (0x01 if rx else 0) | (0x02 if tx else 0)
-    await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, ctrl)
+    await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, _MON_CTRL[rx, tx][0])
 
 
 async def clear_and_enable(usb_bfm: USBBFM, rx=True, tx=True):
     """Clear stats and enable monitoring."""
-    ctrl = (0x01 if rx else 0) | (0x02 if tx else 0) | 0x04  # + clear bit
-    await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, ctrl)
-    await ClockCycles(usb_bfm.clk, 5)
-    # Clear bit auto-clears, but write again without it
-    ctrl = (0x01 if rx else 0) | (0x02 if tx else 0)
-    await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, ctrl)
+    # Clear bit auto-clears in hardware and leaves the enable bits set,
+    # so one write does both
+    await usb_bfm.send_etherbone_write(REG_USB_MON_CTRL, _MON_CTRL[rx, tx][1])
+
+
+# Monitor statistics registers, read together by get_monitor_stats()
+_MONITOR_STATS = (
+    ('rx_captured', REG_USB_MON_RX_CAPTURED),
+    ('rx_dropped', REG_USB_MON_RX_DROPPED),
+    ('tx_captured', REG_USB_MON_TX_CAPTURED),
+    ('tx_dropped', REG_USB_MON_TX_DROPPED),
+    ('rx_truncated', REG_USB_MON_RX_TRUNCATED),
+    ('tx_truncated', REG_USB_MON_TX_TRUNCATED),
+)
 
 
 async def get_monitor_stats(usb_bfm: USBBFM) -> dict:
-    """Read all monitor statistics."""
-    return {
-        'rx_captured': await usb_bfm.send_etherbone_read(REG_USB_MON_RX_CAPTURED),
-        'rx_dropped': await usb_bfm.send_etherbone_read(REG_USB_MON_RX_DROPPED),
-        'tx_captured': await usb_bfm.send_etherbone_read(REG_USB_MON_TX_CAPTURED),
-        'tx_dropped': await usb_bfm.send_etherbone_read(REG_USB_MON_TX_DROPPED),
-        'rx_truncated': await usb_bfm.send_etherbone_read(REG_USB_MON_RX_TRUNCATED),
-        'tx_truncated': await usb_bfm.send_etherbone_read(REG_USB_MON_TX_TRUNCATED),
-    }
+    """Read all monitor statistics in a single Etherbone burst read."""
+    values = await usb_bfm.send_etherbone_burst_read(
+        [addr for _, addr in _MONITOR_STATS])
+    return {name: value for (name, _), value in zip(_MONITOR_STATS, values)}
 
 
 def parse_monitor_packet_safe(data: bytes):
@@ -132,21 +142,21 @@ async def drain_monitor_packets(usb_bfm: USBBFM, max_packets=1000,
     """
     Drain all pending monitor packets.
 
+    Raw packets are collected in one USBBFM.capture_n() call, which stops
+    once the stream has been idle for timeout_per_packet cycles, and are
+    parsed afterwards in a single pass.
+
     Returns list of parsed TLPPacket objects.
     """
-    packets = []
-    first_call = True
-    while len(packets) < max_packets:
-        # Debug only on first call to see what's happening
-        debug = debug_first and first_call
-        first_call = False
-        data = await usb_bfm.receive_monitor_packet(timeout_cycles=timeout_per_packet, debug=debug)
+    raw = []
+    if debug_first:
+        # Debug only the first receive to see what's happening
+        data = await usb_bfm.receive_monitor_packet(timeout_cycles=timeout_per_packet, debug=True)
         if data is None:
-            break
-        pkt = parse_monitor_packet_safe(data)
-        if pkt:
-            packets.append(pkt)
-    return packets
+            return []
+        raw.append(data)
+    raw += await usb_bfm.capture_n(max_packets - len(raw), idle_cycles=timeout_per_packet)
+    return list(filter(None, map(parse_monitor_packet_safe, raw)))
 
 
 # =============================================================================
@@ -171,13 +181,9 @@ async def test_stress_rx_flood(dut):
     await clear_and_enable(usb_bfm, rx=True, tx=False)
 
     # Inject many TLPs as fast as possible
+    mrd = TLPBuilder.make_memory_read_32_template()
     for i in range(STRESS_PACKET_COUNT):
-        beats = TLPBuilder.memory_read_32(
-            address=0x100 + (i * 4),
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i & 0xFF,
-        )
+        beats = TLPBuilder.patch_memory_read_32(mrd, address=0x100 + (i * 4), tag=i & 0xFF)
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
         # Minimal gap - just 2 cycles
         await ClockCycles(dut.sys_clk, 2)
@@ -220,7 +226,8 @@ async def test_stress_rx_flood_with_payload(dut):
     # Use varying payload sizes to stress FIFO
     for i in range(STRESS_PACKET_COUNT):
         payload_size = ((i % 8) + 1) * 4  # 4 to 32 bytes
-        payload = bytes([(i + j) & 0xFF for j in range(payload_size)])
+        start = i & 0xFF
+        payload = _RAMP[start:start + payload_size]
 
         beats = TLPBuilder.memory_write_32(
             address=0x200 + (i * 64),
@@ -282,13 +289,9 @@ async def test_stress_rx_tx_simultaneous(dut):
 
     # Start RX traffic generator
     async def rx_generator():
+        mrd = TLPBuilder.make_memory_read_32_template()
         for i in range(50):
-            beats = TLPBuilder.memory_read_32(
-                address=0x100 + i * 4,
-                length_dw=1,
-                requester_id=0x0100,
-                tag=i & 0xFF,
-            )
+            beats = TLPBuilder.patch_memory_read_32(mrd, address=0x100 + i * 4, tag=i & 0xFF)
             await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
             await ClockCycles(dut.sys_clk, 10)
 
@@ -386,13 +389,9 @@ async def test_stress_sustained_backpressure(dut):
     usb_bfm.set_backpressure(True)
 
     # Inject packets until FIFO overflows
+    mrd = TLPBuilder.make_memory_read_32_template()
     for i in range(50):
-        beats = TLPBuilder.memory_read_32(
-            address=0x100 + i * 4,
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i & 0xFF,
-        )
+        beats = TLPBuilder.patch_memory_read_32(mrd, address=0x100 + i * 4, tag=i & 0xFF)
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
         await ClockCycles(dut.sys_clk, 5)
 
@@ -439,14 +438,10 @@ async def test_stress_etherbone_monitor_interleave(dut):
     etherbone_ok = True
 
     # Interleave Etherbone reads with monitor packet reception
+    mrd = TLPBuilder.make_memory_read_32_template()
     for i in range(30):
         # Inject a TLP
-        beats = TLPBuilder.memory_read_32(
-            address=0x100,
-            length_dw=1,
-            requester_id=0x0100,
-            tag=i & 0xFF,
-        )
+        beats = TLPBuilder.patch_memory_read_32(mrd, address=0x100, tag=i & 0xFF)
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
 
         # Do an Etherbone read
@@ -495,13 +490,9 @@ async def test_stress_etherbone_burst_with_monitor(dut):
 
     # Generate background PCIe traffic
     async def background_traffic():
+        mrd = TLPBuilder.make_memory_read_32_template()
         for i in range(20):
-            beats = TLPBuilder.memory_read_32(
-                address=0x100,
-                length_dw=1,
-                requester_id=0x0100,
-                tag=i,
-            )
+            beats = TLPBuilder.patch_memory_read_32(mrd, address=0x100, tag=i)
             await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
             await ClockCycles(dut.sys_clk, 30)
 
@@ -511,7 +502,8 @@ async def test_stress_etherbone_burst_with_monitor(dut):
     for burst in range(5):
         addresses = [REG_ID, REG_DMACTL, REG_DMA_LEN, REG_USB_MON_CTRL]
         values = await usb_bfm.send_etherbone_burst_read(addresses)
-        dut._log.info(f"Burst {burst}: {[f'0x{v:08X}' for v in values]}")
+        if dut._log.isEnabledFor(logging.INFO):
+            dut._log.info("Burst %d: %s", burst, [f'0x{v:08X}' for v in values])
         await ClockCycles(dut.sys_clk, 20)
 
     await traffic_task
@@ -542,7 +534,9 @@ async def test_stress_random_timing(dut):
 
     await clear_and_enable(usb_bfm, rx=True, tx=False)
 
-    injected_count = 0
+    # Generate the whole random traffic pattern up front so the injection
+    # loop does no PRNG or TLP building work between simulator yields
+    traffic = []
     for i in range(STRESS_PACKET_COUNT):
         # Random: MRd or MWr
         if random.random() < 0.5:
@@ -556,16 +550,18 @@ async def test_stress_random_timing(dut):
             payload_len = random.choice([4, 8, 16, 32])
             beats = TLPBuilder.memory_write_32(
                 address=random.randint(0, 0xFFF) & ~3,
-                data_bytes=bytes([random.randint(0, 255) for _ in range(payload_len)]),
+                data_bytes=random.randbytes(payload_len),
                 requester_id=0x0100,
                 tag=i & 0xFF,
             )
 
+        # Random inter-packet gap
+        traffic.append((beats, random.randint(2, 50)))
+
+    injected_count = 0
+    for beats, gap in traffic:
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
         injected_count += 1
-
-        # Random inter-packet gap
-        gap = random.randint(2, 50)
         await ClockCycles(dut.sys_clk, gap)
 
     await ClockCycles(dut.sys_clk, 500)
@@ -600,15 +596,11 @@ async def test_stress_long_running(dut):
     total_tx_received = 0
     errors = 0
 
+    mrd = TLPBuilder.make_memory_read_32_template()
     for batch in range(LONG_STRESS_PACKET_COUNT // 10):
         # Inject 10 RX packets
         for i in range(10):
-            beats = TLPBuilder.memory_read_32(
-                address=0x100,
-                length_dw=1,
-                requester_id=0x0100,
-                tag=(batch * 10 + i) & 0xFF,
-            )
+            beats = TLPBuilder.patch_memory_read_32(mrd, address=0x100, tag=(batch * 10 + i) & 0xFF)
             await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
             await ClockCycles(dut.sys_clk, 5)
 
@@ -630,7 +622,7 @@ async def test_stress_long_running(dut):
 
         # Progress
         if batch % 10 == 0:
-            dut._log.info(f"Batch {batch}: RX={total_rx_received}, TX={total_tx_received}")
+            dut._log.info("Batch %d: RX=%d, TX=%d", batch, total_rx_received, total_tx_received)
 
     # Final drain
     await ClockCycles(dut.sys_clk, 500)
@@ -671,16 +663,12 @@ async def test_stress_packet_integrity(dut):
     # Note: addresses must be within BAR range (4KB = 0x000-0xFFF) because
     # the depacketizer masks addresses to BAR-relative offsets.
     expected = []
+    mrd = TLPBuilder.make_memory_read_32_template()
     for i in range(50):
         address = 0x100 + (i * 0x10)  # 0x100, 0x110, 0x120, ... (stays within 4KB BAR)
         tag = i
 
-        beats = TLPBuilder.memory_read_32(
-            address=address,
-            length_dw=1,
-            requester_id=0x0100,
-            tag=tag,
-        )
+        beats = TLPBuilder.patch_memory_read_32(mrd, address=address, tag=tag)
         await pcie_bfm.inject_tlp(beats, bar_hit=0b000001)
         expected.append({'address': address, 'tag': tag})
         await ClockCycles(dut.sys_clk, 20)
@@ -693,7 +681,7 @@ async def test_stress_packet_integrity(dut):
 
     # Debug: show first few packets
     for i, pkt in enumerate(packets[:5]):
-        dut._log.info(f"Received pkt {i}: addr=0x{pkt.address:08x}, tag={pkt.tag}")
+        dut._log.info("Received pkt %d: addr=0x%08x, tag=%d", i, pkt.address, pkt.tag)
     if expected[:5]:
         dut._log.info(f"Expected first 5: {expected[:5]}")
 
@@ -735,7 +723,7 @@ async def test_stress_width_converter_boundary(dut):
     test_sizes = [4, 8, 12, 16, 20, 24, 28, 32, 36, 40, 60, 64]
 
     for size in test_sizes:
-        payload = bytes([i & 0xFF for i in range(size)])
+        payload = _RAMP[:size]
 
         beats = TLPBuilder.memory_write_32(
             address=0x200,